@@ -0,0 +1,378 @@
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from multiprocessing import cpu_count
+
+from main import files, collect_data, vacancy_fields, field_defaults, RowDecoder, CSVReader, TextEditor, DataWorker, \
+    InputConect, Table, Report, print_data, main_futures, statistics_fields, currency_to_rub
+
+
+def bench_workers(dir, prof_name, max_workers, executor_type="process", repeat=3):
+    """Замеряет пропускную способность статистики для разного числа работников
+
+        Args:
+            dir (str): Папка с csv файлами по годам
+            prof_name (str): Имя выбранной профессии
+            max_workers (int): Наибольшее число работников
+            executor_type (str): "process" или "thread"
+            repeat (int): Число повторов, берется лучшее время
+
+        Returns:
+            list: Строки [число работников, время в секундах, вакансий в секунду]
+    """
+    file_names = list(files(dir))
+    results = []
+    for workers in range(1, max_workers + 1):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            total_vacancies = collect_data(file_names, prof_name, workers, executor_type)[1]
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results.append([workers, best, total_vacancies / best])
+    return results
+
+
+def decode_with_index(row, fields):
+    """Разбирает строку поиском индекса каждого поля, как csv_filer до появления RowDecoder
+
+        Args:
+            row (list): Строка csv
+            fields (list): Заголовок csv файла
+
+        Returns:
+            tuple: Значения полей
+    """
+    return tuple(row[fields.index(name)] if name in fields else field_defaults.get(name, "") for name in vacancy_fields)
+
+
+def bench_decoder(file_name, repeat=5):
+    """Сравнивает скорость разбора строк поиском индексов и через RowDecoder
+
+        Args:
+            file_name (str): Название csv файла
+            repeat (int): Число повторов, берется лучшее время
+
+        Returns:
+            dict: Строк в секунду для каждого способа
+    """
+    with open(file_name, encoding="UTF-8-sig") as File:
+        reader = csv.reader(File, delimiter=',')
+        fields = next(reader)
+        rows = list(reader)
+    decoders = {
+        "fields.index": lambda: [decode_with_index(row, fields) for row in rows],
+        "RowDecoder": lambda: list(map(RowDecoder(fields).decode, rows))
+    }
+    results = {}
+    for name, decode in decoders.items():
+        best = min(timed(decode) for _ in range(repeat))
+        results[name] = len(rows) / best
+    return results
+
+
+def strip_with_regex(string):
+    """Очищает строку от HTML тегов так, как TextEditor.beautifulStr до появления кэша и разбора сущностей
+
+        Args:
+            string (str): Строка для очистки от тегов
+
+        Returns:
+            str: Текст с удаленными HTML тегами
+    """
+    return ' '.join(re.sub(r"<[^>]+>", '', string).split()).replace("  ", " ")
+
+
+def bench_html(file_name, column="description", repeat=3):
+    """Сравнивает очистку столбца от HTML: старая функция, новая без кэша и с кэшем
+
+        Args:
+            file_name (str): Название csv файла
+            column (str): Столбец с HTML текстом
+            repeat (int): Число повторов, берется лучшее время
+
+        Returns:
+            dict: Строк в секунду для каждого способа
+    """
+    with open(file_name, encoding="UTF-8-sig") as File:
+        reader = csv.reader(File, delimiter=',')
+        index = next(reader).index(column)
+        texts = [row[index] for row in reader if len(row) > index]
+    cleaners = {
+        "regex": lambda: [strip_with_regex(text) for text in texts],
+        "clean_html": lambda: [TextEditor.clean_html(text) for text in texts],
+        "beautifulStr": lambda: [TextEditor.beautifulStr(text) for text in texts]
+    }
+    results = {}
+    for name, clean in cleaners.items():
+        TextEditor.clean_cached.cache_clear()
+        best = min(timed(clean) for _ in range(repeat))
+        results[name] = len(texts) / best
+    return results
+
+
+synthetic_names = ["Программист", "Программист Python", "Аналитик", "Инженер-программист", "Менеджер по продажам",
+                   "Бухгалтер", "Тестировщик", "Системный администратор", "Водитель", "Дизайнер"]
+
+
+def write_synthetic(file_name, rows, years, cities, currencies, seed=0, full=False):
+    """Создает csv файл со случайными вакансиями в формате папки csv
+
+        Args:
+            file_name (str): Название файла
+            rows (int): Число вакансий
+            years (list): Годы публикации
+            cities (int): Число различных городов
+            currencies (int): Число различных валют
+            seed (int): Начальное значение генератора случайных чисел
+            full (bool): Записать все поля вакансии, как для табличного режима, а не только поля статистики
+    """
+    rng = random.Random(seed)
+    city_names = ["Город " + str(index) for index in range(cities)]
+    currency_names = list(currency_to_rub)[:max(1, min(currencies, len(currency_to_rub)))]
+    experiences = ["noExperience", "between1And3", "between3And6", "moreThan6"]
+    skills = ["Python", "SQL", "Git", "Linux", "Excel", "1С", "Docker"]
+    with open(file_name, "w", encoding="utf-8-sig", newline="") as File:
+        writer = csv.writer(File, lineterminator="\n")
+        writer.writerow(vacancy_fields if full else statistics_fields)
+        for _ in range(rows):
+            salary_from = rng.randrange(10, 200) * 1000
+            values = {
+                "name": rng.choice(synthetic_names),
+                "description": "<p><b>Обязанности:</b> " + rng.choice(synthetic_names) + "&nbsp;и другое</p>",
+                "key_skills": "\n".join(rng.sample(skills, rng.randrange(1, 4))),
+                "experience_id": rng.choice(experiences),
+                "premium": rng.choice(["True", "False"]),
+                "employer_name": "Компания " + str(rng.randrange(100)),
+                "area_name": rng.choice(city_names),
+                "salary_from": float(salary_from),
+                "salary_to": float(salary_from + rng.randrange(0, 100) * 1000),
+                "salary_gross": rng.choice(["True", "False"]),
+                "salary_currency": rng.choice(currency_names),
+                "published_at": "{0}-{1:02}-{2:02}T{3:02}:00:00+0300".format(rng.choice(years), rng.randrange(1, 13),
+                                                                              rng.randrange(1, 29), rng.randrange(24))
+            }
+            writer.writerow([values[field] for field in (vacancy_fields if full else statistics_fields)])
+
+
+def generate_dataset(out_dir, rows, years, cities, currencies, seed=0):
+    """Создает набор данных для бенчмарков: по файлу на каждый год и один файл со всеми полями для табличного режима
+
+        Args:
+            out_dir (str): Папка для файлов
+            rows (int): Число вакансий в каждом файле
+            years (list): Годы
+            cities (int): Число различных городов
+            currencies (int): Число различных валют
+            seed (int): Начальное значение генератора случайных чисел
+
+        Returns:
+            [list, str]: Файлы по годам и файл для табличного режима
+    """
+    file_names = []
+    for year in years:
+        file_name = os.path.join(out_dir, "vacancies_" + str(year) + ".csv")
+        write_synthetic(file_name, rows, [year], cities, currencies, seed + year)
+        file_names.append(file_name)
+    table_name = os.path.join(out_dir, "table.csv")
+    write_synthetic(table_name, rows, years, cities, currencies, seed, full=True)
+    return [file_names, table_name]
+
+
+def bench_suite(rows=20000, years=(2007, 2008, 2009, 2010), cities=50, currencies=5, repeat=3, prof_name="Программист"):
+    """Замеряет основные этапы обеих программ на синтетических данных
+
+        Args:
+            rows (int): Число вакансий в каждом файле
+            years (list): Годы
+            cities (int): Число различных городов
+            currencies (int): Число различных валют
+            repeat (int): Число повторов, берется лучшее время
+            prof_name (str): Имя профессии для статистики
+
+        Returns:
+            dict: Параметры запуска и время каждого этапа в секундах (None, если этап не удалось выполнить)
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as out_dir:
+        file_names, table_name = generate_dataset(out_dir, rows, list(years), cities, currencies)
+        columns = CSVReader().get_columns(file_names[0])
+        vacancies = CSVReader().get_vacancies(table_name)[1]
+        data = collect_data(file_names, prof_name, executor_type="thread")
+        input_connect = InputConect("Опыт работы: Нет опыта", "Оклад", "Да", "1 21", "")
+        benches = {
+            "get_vacancies": lambda: CSVReader().get_vacancies(table_name),
+            "get_columns": lambda: CSVReader().get_columns(file_names[0]),
+            "get_data": lambda: DataWorker().get_data(prof_name, columns),
+            "collect_data": lambda: collect_data(file_names, prof_name),
+            "table_filter": lambda: Table(vacancies, vacancy_fields, input_connect).filter(),
+            "table_sort": lambda: Table(vacancies, vacancy_fields, input_connect).sort_vacancies(vacancies),
+            "report": lambda: Report("graph.jpg", print_data(*data), prof_name, os.path.join(out_dir, "graph.png")),
+            "main_futures": lambda: main_futures(file_names, prof_name, pdf_name=os.path.join(out_dir, "report.pdf"),
+                                                 image_path=os.path.join(out_dir, "temp.png")),
+            "startup": lambda: start_python(startup_scenarios["import main"])
+        }
+        for name, bench in benches.items():
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    results[name] = min(timed(bench) for _ in range(repeat))
+            except OSError as error:
+                # Например, wkhtmltopdf из REPORT_PDF_BACKEND не найден или завершился с ошибкой
+                print("Пропущен", name + ":", error, file=sys.stderr)
+                results[name] = None
+    return {"meta": {"rows": rows, "years": list(years), "cities": cities, "currencies": currencies, "repeat": repeat,
+                     "python": platform.python_version(), "cpu_count": cpu_count()},
+            "results": results}
+
+
+def find_regressions(results, baseline, tolerance=0.25):
+    """Сравнивает результаты с сохраненными и находит этапы, ставшие медленнее более чем на tolerance
+
+        Args:
+            results (dict): Результаты bench_suite
+            baseline (dict): Сохраненные результаты bench_suite
+            tolerance (float): Допустимое замедление, доля от времени в baseline
+
+        Returns:
+            list: [этап, время в baseline, текущее время] для каждой регрессии
+    """
+    regressions = []
+    for name, expected in baseline["results"].items():
+        actual = results["results"].get(name)
+        if expected is not None and actual is not None and actual > expected * (1 + tolerance):
+            regressions.append([name, expected, actual])
+    return regressions
+
+
+startup_scenarios = {
+    "python": "pass",
+    "import main": "import main"
+}
+
+heavy_modules = ["matplotlib", "numpy", "prettytable", "pdfkit", "doctest"]
+
+
+def start_python(code):
+    """Запускает код в новом интерпретаторе из папки программы и ждет его завершения
+
+        Args:
+            code (str): Код на Python
+
+        Returns:
+            str: Вывод интерпретатора
+    """
+    return subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)), check=True,
+                          stdout=subprocess.PIPE, text=True).stdout
+
+
+def loaded_modules(code, modules=heavy_modules):
+    """Находит тяжелые модули, которые загружаются при выполнении кода в новом интерпретаторе
+
+        Args:
+            code (str): Код на Python
+            modules (list): Имена проверяемых модулей
+
+        Returns:
+            list: Загруженные модули
+    """
+    output = start_python(code + "\nimport sys\nprint(' '.join(x for x in " + repr(modules) + " if x in sys.modules))")
+    return output.split()
+
+
+def bench_startup(repeat=10):
+    """Замеряет холодный запуск: время от старта интерпретатора до его завершения для каждого сценария
+
+        Args:
+            repeat (int): Число повторов, берется лучшее время
+
+        Returns:
+            dict: Время в секундах для каждого сценария
+    """
+    return {name: min(timed(lambda: start_python(code)) for _ in range(repeat)) for name, code in startup_scenarios.items()}
+
+
+def timed(function):
+    """Возвращает время выполнения функции в секундах
+
+        Args:
+            function (callable): Функция без аргументов
+
+        Returns:
+            float: Время выполнения
+    """
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарки статистики по вакансиям")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    workers_parser = subparsers.add_parser("workers", help="Масштабирование статистики по числу работников")
+    workers_parser.add_argument("--dir", default="csv", help="Папка с csv файлами по годам")
+    workers_parser.add_argument("--prof", default="Программист", help="Имя профессии")
+    workers_parser.add_argument("--workers", type=int, default=cpu_count(), help="Наибольшее число работников")
+    workers_parser.add_argument("--executor", default="process", choices=["process", "thread"])
+    workers_parser.add_argument("--repeat", type=int, default=3)
+
+    decoder_parser = subparsers.add_parser("decoder", help="Скорость разбора строк csv")
+    decoder_parser.add_argument("--file", default="csv/vacancies_2010.csv", help="Название csv файла")
+    decoder_parser.add_argument("--repeat", type=int, default=5)
+
+    html_parser = subparsers.add_parser("html", help="Очистка текста от HTML тегов")
+    html_parser.add_argument("--file", required=True, help="Название csv файла")
+    html_parser.add_argument("--column", default="description", help="Столбец с HTML текстом")
+    html_parser.add_argument("--repeat", type=int, default=3)
+
+    suite_parser = subparsers.add_parser("suite", help="Все этапы на синтетических данных с проверкой регрессий")
+    suite_parser.add_argument("--rows", type=int, default=20000, help="Число вакансий в каждом файле")
+    suite_parser.add_argument("--years", type=int, nargs="+", default=[2007, 2008, 2009, 2010])
+    suite_parser.add_argument("--cities", type=int, default=50)
+    suite_parser.add_argument("--currencies", type=int, default=5)
+    suite_parser.add_argument("--repeat", type=int, default=3)
+    suite_parser.add_argument("--out", default="benchmark.json", help="Файл для результатов")
+    suite_parser.add_argument("--baseline", help="Файл с сохраненными результатами для сравнения")
+    suite_parser.add_argument("--tolerance", type=float, default=0.25, help="Допустимое замедление, доля")
+
+    startup_parser = subparsers.add_parser("startup", help="Холодный запуск программы")
+    startup_parser.add_argument("--repeat", type=int, default=10)
+
+    args = parser.parse_args()
+    if args.command == "workers":
+        print("Работники | Время, с | Вакансий/с")
+        for workers, elapsed, throughput in bench_workers(args.dir, args.prof, args.workers, args.executor, args.repeat):
+            print("{0:9} | {1:8.3f} | {2:10.0f}".format(workers, elapsed, throughput))
+    elif args.command == "decoder":
+        for name, throughput in bench_decoder(args.file, args.repeat).items():
+            print("{0:12} | {1:10.0f} строк/с".format(name, throughput))
+    elif args.command == "html":
+        for name, throughput in bench_html(args.file, args.column, args.repeat).items():
+            print("{0:12} | {1:10.0f} строк/с".format(name, throughput))
+    elif args.command == "suite":
+        results = bench_suite(args.rows, args.years, args.cities, args.currencies, args.repeat)
+        with open(args.out, "w", encoding="utf-8") as File:
+            json.dump(results, File, ensure_ascii=False, indent=2)
+        for name, elapsed in results["results"].items():
+            print("{0:14} | {1}".format(name, "-" if elapsed is None else "{0:.3f} с".format(elapsed)))
+        if args.baseline is not None:
+            with open(args.baseline, encoding="utf-8") as File:
+                regressions = find_regressions(results, json.load(File), args.tolerance)
+            for name, expected, actual in regressions:
+                print("Регрессия {0}: {1:.3f} с -> {2:.3f} с".format(name, expected, actual))
+            if len(regressions) != 0:
+                sys.exit(1)
+    elif args.command == "startup":
+        for name, elapsed in bench_startup(args.repeat).items():
+            print("{0:12} | {1:6.3f} с".format(name, elapsed))
+        print("Загружено при импорте:", " ".join(loaded_modules(startup_scenarios["import main"])) or "-")
@@ -1,15 +1,66 @@
-from multiprocessing import Pool, cpu_count
+from multiprocessing import cpu_count
 import csv
+import io
+import hashlib
+import shutil
+import subprocess
+import json
 import os
+import sys
 import re
-import matplotlib.pyplot as plt
-import numpy as np
+import html
 from os import path
-from prettytable import PrettyTable
-import pdfkit
-import doctest
 import concurrent.futures
-from functools import partial
+import math
+import heapq
+from array import array
+from collections import deque, OrderedDict
+from functools import partial, lru_cache, wraps
+from contextlib import contextmanager, nullcontext
+import threading
+import time
+import tempfile
+import cProfile
+import pstats
+from operator import itemgetter
+from itertools import islice
+
+# numpy, matplotlib и prettytable загружаются долго и нужны не во всех режимах,
+# поэтому импортируются только при первом обращении через load_numpy, load_matplotlib и load_prettytable
+
+def load_numpy():
+    """Импортирует numpy при первом обращении
+
+        Returns:
+            module: numpy
+    """
+    import numpy
+    return numpy
+
+def load_matplotlib(pdf=False):
+    """Импортирует matplotlib с модулями style и figure при первом обращении
+
+        Args:
+            pdf (bool): Импортировать также matplotlib.backends.backend_pdf для сохранения в pdf
+
+        Returns:
+            module: matplotlib
+    """
+    import matplotlib
+    import matplotlib.style
+    import matplotlib.figure
+    if pdf:
+        import matplotlib.backends.backend_pdf
+    return matplotlib
+
+def load_prettytable():
+    """Импортирует prettytable при первом обращении
+
+        Returns:
+            type: Класс PrettyTable
+    """
+    from prettytable import PrettyTable
+    return PrettyTable
 
 experienceToRus = {
     "noExperience": "Нет опыта",
@@ -62,6 +113,15 @@ currency_to_rub = {
     "UZS": 0.0055
 }
 
+profiler = None
+
+render_lock = threading.Lock()
+
+executors = {
+    "process": concurrent.futures.ProcessPoolExecutor,
+    "thread": concurrent.futures.ThreadPoolExecutor
+}
+
 fieldToRus = {
     "name": "Название",
     "description": "Описание",
@@ -77,11 +137,121 @@ fieldToRus = {
     "":""
 }
 
+vacancy_fields = ["name", "description", "key_skills", "experience_id", "premium", "employer_name", "area_name",
+                  "salary_from", "salary_to", "salary_gross", "salary_currency", "published_at"]
+
+statistics_fields = ["name", "salary_from", "salary_to", "salary_currency", "area_name", "published_at"]
+
+field_defaults = {
+    "salary_currency": "RUR"
+}
+
 def files(path):
     for file in os.listdir(path):
         if os.path.isfile(os.path.join(path, file)):
             yield path + "/" + file
 
+def ends_in_quotes(data, start=0, end=None, in_quotes=False):
+    """Определяет, заканчивается ли участок csv в байтах внутри поля в кавычках.
+    Как и в модуле csv, кавычка открывает поле в кавычках только в начале поля, а внутри обычного поля
+    остается простым символом. start должен быть началом записи или, при in_quotes, позицией внутри поля в кавычках
+
+        Args:
+            data (bytes): Содержимое файла или его часть
+            start (int): Начало участка
+            end (int): Конец участка, None для конца data
+            in_quotes (bool): Находится ли start внутри поля в кавычках
+
+        Returns:
+            bool: Находится ли конец участка внутри поля в кавычках
+
+    >>> ends_in_quotes(b'a,"x,\\n')
+    True
+    >>> ends_in_quotes(b'27" monitor,100')
+    False
+    >>> ends_in_quotes(b'y "",z",1', in_quotes=True)
+    False
+    """
+    end = len(data) if end is None else end
+    position = start
+    while True:
+        quote = data.find(b'"', position, end)
+        if quote == -1:
+            return in_quotes
+        if not in_quotes:
+            in_quotes = quote == start or data[quote - 1] in b",\n"
+        elif quote + 1 < end and data[quote + 1] == data[quote]:
+            # Удвоенная кавычка внутри поля в кавычках
+            quote += 1
+        else:
+            in_quotes = False
+        position = quote + 1
+
+def split_file_ranges(file_name, parts, block_size=1 << 20):
+    """Делит csv файл без заголовка на диапазоны байт, границы которых совпадают с концами записей.
+    Перевод строки внутри поля в кавычках не считается концом записи, поэтому многострочные поля не разрываются
+
+        Args:
+            file_name (str): Название файла
+            parts (int): Желаемое число диапазонов
+            block_size (int): Размер блока для чтения
+
+        Returns:
+            list: Диапазоны [начало, конец) в байтах, первый начинается после заголовка
+    """
+    size = os.path.getsize(file_name)
+    with open(file_name, "rb") as File:
+        File.readline()
+        start = File.tell()
+        bounds = [start]
+        position = start
+        in_quotes = False
+        for part in range(1, parts):
+            target = max(start + (size - start) * part // parts, position)
+            # Состояние кавычек отслеживается от начала данных. Блоки дочитываются до конца строки,
+            # поэтому каждый следующий блок начинается с начала записи или внутри поля в кавычках
+            File.seek(position)
+            while position < size:
+                block = File.read(block_size) + File.readline()
+                offset = 0
+                newline = block.find(b"\n", max(target - position, 0))
+                while newline != -1:
+                    in_quotes = ends_in_quotes(block, offset, newline, in_quotes)
+                    if not in_quotes:
+                        break
+                    offset = newline
+                    newline = block.find(b"\n", newline + 1)
+                if newline != -1:
+                    position += newline + 1
+                    break
+                in_quotes = ends_in_quotes(block, offset, len(block), in_quotes)
+                position += len(block)
+            if bounds[-1] < position < size:
+                bounds.append(position)
+        bounds.append(size)
+    return [[bounds[i], bounds[i + 1]] for i in range(len(bounds) - 1)]
+
+def read_range_lines(file_name, start, end):
+    """Построчно читает диапазон байт файла
+
+        Args:
+            file_name (str): Название файла
+            start (int): Начало диапазона
+            end (int): Конец диапазона
+
+        Yields:
+            str: Строки диапазона
+    """
+    with open(file_name, "rb") as File:
+        File.seek(start)
+        position = start
+        while position < end:
+            line = File.readline()
+            if not line:
+                break
+            position += len(line)
+            yield line.decode("utf-8")
+
 def get_key(d, value):
     """Получает первый ключ по значению
 
@@ -102,19 +272,309 @@ def get_key(d, value):
         if v == value:
             return k
 
+class StageProfiler:
+    """Класс для замера времени этапов обработки (read, decode, aggregate, merge, plot, html, pdf) и счетчиков.
+    Время этапа суммируется по всем потокам и процессам, поэтому может превышать общее время работы
+
+        Attributes:
+            profile_dir (str): Папка для дампов cProfile работников, None чтобы не снимать их
+            stages (dict): Этап и [суммарное время в секундах, число вызовов]
+            counters (dict): Счетчики
+    """
+    def __init__(self, profile_dir=None):
+        """Инициализирует объект StageProfiler
+
+            Args:
+                profile_dir (str): Папка для дампов cProfile работников, None чтобы не снимать их
+        """
+        self.profile_dir = profile_dir
+        self.stages = {}
+        self.counters = {}
+        self.__lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        """Замеряет время выполнения блока как этап name
+
+            Args:
+                name (str): Название этапа
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name, seconds, calls=1):
+        """Добавляет время к этапу
+
+            Args:
+                name (str): Название этапа
+                seconds (float): Время в секундах
+                calls (int): Число вызовов
+        """
+        with self.__lock:
+            stage = self.stages.setdefault(name, [0.0, 0])
+            stage[0] += seconds
+            stage[1] += calls
+
+    def count(self, name, value=1):
+        """Увеличивает счетчик
+
+            Args:
+                name (str): Название счетчика
+                value (int): На сколько увеличить
+        """
+        with self.__lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def report(self):
+        """Возвращает отчет в виде, пригодном для JSON и для merge
+
+            Returns:
+                dict: Этапы с временем и числом вызовов и счетчики
+        """
+        with self.__lock:
+            return {"stages": {name: {"seconds": seconds, "calls": calls} for name, (seconds, calls) in self.stages.items()},
+                    "counters": dict(self.counters)}
+
+    def merge(self, report):
+        """Добавляет отчет другого профайлера, например из процесса пула
+
+            Args:
+                report (dict): Отчет из report
+        """
+        for name, stage in report["stages"].items():
+            self.add(name, stage["seconds"], stage["calls"])
+        for name, value in report["counters"].items():
+            self.count(name, value)
+
+    def save(self, file_name):
+        """Сохраняет отчет в JSON файл
+
+            Args:
+                file_name (str): Название файла
+        """
+        with open(file_name, "w", encoding="utf-8") as File:
+            json.dump(self.report(), File, ensure_ascii=False, indent=2)
+
+    def run(self, function, *args):
+        """Выполняет функцию, сохраняя дамп cProfile в profile_dir, если она задана
+
+            Args:
+                function (callable): Функция
+                args: Аргументы функции
+
+            Returns:
+                object: Результат функции
+        """
+        if self.profile_dir is None:
+            return function(*args)
+        os.makedirs(self.profile_dir, exist_ok=True)
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(function, *args)
+        finally:
+            handle, dump_name = tempfile.mkstemp(prefix="profile_" + str(os.getpid()) + "_", suffix=".prof", dir=self.profile_dir)
+            os.close(handle)
+            profile.dump_stats(dump_name)
+
+    def merge_profiles(self, file_name):
+        """Объединяет все дампы cProfile из profile_dir в один файл для pstats или snakeviz.
+        Дампы предыдущих запусков удаляются в enable_profiling
+
+            Args:
+                file_name (str): Название итогового файла
+
+            Returns:
+                int: Число объединенных дампов
+        """
+        dumps = [path.join(self.profile_dir, x) for x in sorted(os.listdir(self.profile_dir))
+                 if x.startswith("profile_") and x.endswith(".prof")]
+        if len(dumps) != 0:
+            pstats.Stats(*dumps).dump_stats(file_name)
+        return len(dumps)
+
+def enable_profiling(profile_dir=None):
+    """Включает замер этапов в текущем процессе
+
+        Args:
+            profile_dir (str): Папка для дампов cProfile работников, None чтобы не снимать их
+
+        Returns:
+            StageProfiler: Профайлер
+    """
+    global profiler
+    if profile_dir is not None and path.isdir(profile_dir):
+        for dump_name in os.listdir(profile_dir):
+            if dump_name.startswith("profile_") and dump_name.endswith(".prof"):
+                os.remove(path.join(profile_dir, dump_name))
+    profiler = StageProfiler(profile_dir)
+    return profiler
+
+def disable_profiling():
+    """Выключает замер этапов в текущем процессе
+
+        Returns:
+            StageProfiler: Профайлер, который был включен, или None
+    """
+    global profiler
+    current, profiler = profiler, None
+    return current
+
+def profile_stage(name):
+    """Возвращает контекст замера этапа или пустой контекст, если замер выключен
+
+        Args:
+            name (str): Название этапа
+
+        Returns:
+            contextmanager: Контекст замера
+    """
+    return profiler.stage(name) if profiler is not None else nullcontext()
+
+def profile_count(name, value=1):
+    """Увеличивает счетчик, если замер включен
+
+        Args:
+            name (str): Название счетчика
+            value (int): На сколько увеличить
+    """
+    if profiler is not None:
+        profiler.count(name, value)
+
+def timed_stage(name):
+    """Декоратор, замеряющий время каждого вызова функции как этап name
+
+        Args:
+            name (str): Название этапа
+
+        Returns:
+            callable: Декоратор
+    """
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with profile_stage(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def profiled_task(profile_dir, in_process, function, *args):
+    """Выполняет задачу пула с замером этапов. В процессе пула замер ведется отдельным профайлером,
+    отчет которого возвращается вместе с результатом, в потоке - общим профайлером процесса
+
+        Args:
+            profile_dir (str): Папка для дампов cProfile, None чтобы не снимать их
+            in_process (bool): Задача выполняется в отдельном процессе
+            function (callable): Функция задачи
+            args: Аргументы функции
+
+        Returns:
+            [object, dict]: Результат функции и отчет профайлера процесса или None
+    """
+    global profiler
+    if in_process:
+        profiler = StageProfiler(profile_dir)
+        return [profiler.run(function, *args), profiler.report()]
+    return [StageProfiler(profile_dir).run(function, *args), None]
+
+def submit_task(executor, executor_type, function, *args):
+    """Ставит задачу в пул, при включенном замере - через profiled_task
+
+        Args:
+            executor (Executor): Пул
+            executor_type (str): "process" или "thread"
+            function (callable): Функция задачи
+            args: Аргументы функции
+
+        Returns:
+            Future: Задача
+    """
+    if profiler is None:
+        return executor.submit(function, *args)
+    return executor.submit(profiled_task, profiler.profile_dir, executor_type == "process", function, *args)
+
+def task_result(future):
+    """Возвращает результат задачи из submit_task, добавляя отчет процесса пула к профайлеру
+
+        Args:
+            future (Future): Задача
+
+        Returns:
+            object: Результат функции задачи
+    """
+    if profiler is None:
+        return future.result()
+    result, report = future.result()
+    if report is not None:
+        profiler.merge(report)
+    return result
+
 class TextEditor:
     """Класс для работы с текстом и его форматирования
     """
+    # Один проход по строке: серия пробельных символов, тегов и &nbsp; заменяется одним пробелом
+    # (или ничем, если в ней только теги), остальные HTML сущности - символами.
+    # Одиночный пробел между словами не меняется, поэтому не совпадает с шаблоном.
+    # Опережающая проверка первого символа отсекает позиции, с которых совпадение начаться не может
+    html_tokens = re.compile(r"(?=[\s<&])(?:(?!(?<=.) (?=[^\s<&]))(?:\s|<[^>]+>|&nbsp;)+|&#?\w+;?)")
+    html_tags = re.compile(r"<[^>]+>")
+    # Кэшируются только короткие строки (названия, города), длинные описания не удерживаются в памяти
+    cache_limit = 200
+
+    def clean_token(match):
+        """Возвращает замену для найденной html_tokens части строки
+
+            Args:
+                match (re.Match): Серия пробелов и тегов или HTML сущность
+
+            Returns:
+                str: Замена
+        """
+        token = match.group()
+        if token[0] == "&" and not token.startswith("&nbsp;"):
+            return html.unescape(token)
+        if match.start() == 0 or match.end() == len(match.string):
+            return ""
+        if "<" not in token or TextEditor.html_tags.sub("", token) != "":
+            return " "
+        return ""
+
+    def clean_html(string : str):
+        """Возвращает str из которой удалены все HTML теги, HTML сущности (в том числе &nbsp;) заменены символами,
+        а пробельные символы схлопнуты в один пробел. Строка разбирается за один проход
+
+            Args:
+                string (str): Строка для очистки от тегов
+
+            Returns:
+                str: Текст с удаленными HTML тегами
+
+        >>> TextEditor.clean_html("<p>Опыт&nbsp;от <b>3</b>&nbsp;лет</p>\\n&lt;C++&gt;")
+        'Опыт от 3 лет <C++>'
+        """
+        if "<" not in string and "&" not in string:
+            return " ".join(string.split())
+        return TextEditor.html_tokens.sub(TextEditor.clean_token, string)
+
+    clean_cached = lru_cache(maxsize=1 << 13)(clean_html)
+
     def beautifulStr(string : str):
-        """Возвращает str из которой удалены все HTML теги
+        """Очищает строку от HTML так же, как clean_html. Результаты для коротких повторяющихся строк кэшируются
 
             Args:
                 string (str): Строка для очистки от тегов
 
             Returns:
                 str: Текст с удаленными HTML тегами
+
+        >>> TextEditor.beautifulStr("<br><b>x</b>yz</br>")
+        'xyz'
         """
-        return ' '.join(re.sub(r"<[^>]+>", '', string).split()).replace("  ", " ").replace(" ", " ")
+        if len(string) <= TextEditor.cache_limit:
+            return TextEditor.clean_cached(string)
+        return TextEditor.clean_html(string)
 
     def line_trim(string : str):
         """Обрезает str до 100 символов
@@ -220,7 +680,7 @@ class InputConect:
             Returns:
                 list: Массив размером 1 с ошибкой, иначе массив размером 3 с преобразованными параметрами 
         """
-        if (sort_field_input != "" and sort_field_input not in list(fieldToRus.values())):
+        if (sort_field_input != "" and any(x not in list(fieldToRus.values()) for x in sort_field_input.split(", "))):
             return ["Параметр сортировки некорректен"]
         elif (sort_field_input == ""):
             return ["Нет"]
@@ -276,6 +736,8 @@ class Salary:
         salary_gross (str): Наличие включенного налога
         salary_currency (str): Валюта оклада
     """
+    __slots__ = ("salary_from", "salary_to", "salary_gross", "salary_currency")
+
     def __init__(self, salary_from : str, salary_to : str, salary_gross : str, salary_currency : str):
         """Инициализирует объект Salary, выполняет конвертацию для полей.
 
@@ -291,8 +753,8 @@ class Salary:
         100
         >>> Salary("100","2000", "true", "RUR").salary_currency
         'RUR'
-        >>> type(Salary("100","2000", "true", "RUR"))
-        <class '__main__.Salary'>
+        >>> type(Salary("100","2000", "true", "RUR")).__name__
+        'Salary'
         """
         self.salary_from = int(float(salary_from))
         self.salary_to = int(float(salary_to))
@@ -333,6 +795,9 @@ class Vacancy:
         area_name (str): Город работы
         published_at (str): Дата публикации вакансии
     """
+    __slots__ = ("name", "__raw_description", "__description", "__raw_key_skills", "__key_skills", "experience_id",
+                 "premium", "employer_name", "salary", "area_name", "published_at")
+
     def __init__(self, name : str, description : str, key_skills : str, experience_id : str, 
                     premium : str, employer_name : str, salary : Salary, area_name : str, published_at : str):
         """Инициализирует объект Vacancy, выполняет конвертацию дляполей.
@@ -354,8 +819,11 @@ class Vacancy:
         'xyz'
         """
         self.name = name
-        self.description = TextEditor.beautifulStr(description)
-        self.key_skills = list(key_skills.split("\n"))
+        # Очистка описания и разбиение навыков выполняются при первом обращении
+        self.__raw_description = description
+        self.__description = None
+        self.__raw_key_skills = key_skills
+        self.__key_skills = None
         self.experience_id = experience_id
         self.premium = premium
         self.employer_name = employer_name
@@ -363,6 +831,36 @@ class Vacancy:
         self.area_name = area_name
         self.published_at = published_at
 
+    @property
+    def description(self):
+        """Описание вакансии без HTML тегов, вычисляется при первом обращении
+
+            Returns:
+                str: Описание вакансии
+        """
+        if self.__description is None:
+            self.__description = TextEditor.beautifulStr(self.__raw_description)
+        return self.__description
+
+    @description.setter
+    def description(self, value):
+        self.__description = value
+
+    @property
+    def key_skills(self):
+        """Ключевые навыки, вычисляются при первом обращении
+
+            Returns:
+                list: Ключевые навыки
+        """
+        if self.__key_skills is None:
+            self.__key_skills = self.__raw_key_skills.split("\n")
+        return self.__key_skills
+
+    @key_skills.setter
+    def key_skills(self, value):
+        self.__key_skills = value
+
     def date_to_string(self):
         """Переводит аттрибут published_at класса Vacancy в формат dd.mm.yyyy
 
@@ -452,8 +950,76 @@ class Vacancy:
         return [TextEditor.beautifulStr(self.name), self.description_to_string(), self.skills_to_string(), self.experience_to_string(), self.premium_to_string(),  
                 self.employer_name, self.salary.to_string(), self.area_name, self.date_to_string()]
 
+    def to_row(self, titles):
+        """Возвращает только требуемые столбцы вакансии для таблицы, не форматируя остальные
+
+            Args:
+                titles (list): Заголовки столбцов в порядке table_titles
+
+            Returns:
+                list: Значения столбцов
+
+        >>> Vacancy("x", "<br><b>x</b>yz</br>", 'z', "between3And6", "true", "x", Salary("100", "2000", "true", "RUR"), "x", "2007-12-03T17:40:09+0300").to_row(["Опыт работы", "Оклад"])
+        ['От 3 до 6 лет', '100 - 2 000 (Рубли) (Без вычета налогов)']
+        """
+        return [table_columns[title](self) for title in titles]
+
+table_columns = {
+    "Название": lambda vacancy: TextEditor.beautifulStr(vacancy.name),
+    "Описание": Vacancy.description_to_string,
+    "Навыки": Vacancy.skills_to_string,
+    "Опыт работы": Vacancy.experience_to_string,
+    "Премиум-вакансия": Vacancy.premium_to_string,
+    "Компания": lambda vacancy: vacancy.employer_name,
+    "Оклад": lambda vacancy: vacancy.salary.to_string(),
+    "Название региона": lambda vacancy: vacancy.area_name,
+    "Дата публикации вакансии": Vacancy.date_to_string
+}
+
+report_head = """<!DOCTYPE html>
+                    <html lang="en">
+                    <head>
+                        <meta charset="UTF-8">
+                        <title>Report</title>
+                    </head>
+                    <style>
+                    body{
+                        font-family: Verdana;
+                    }
+                    table{
+                        text-align: center;
+                        border-collapse: collapse;
+                    }
+                    th, td{
+                        border: 1px solid;
+                        padding: 5px;
+                    }
+                    </style>
+                    <body>
+                    <h1 style="text-align: center; font-size: 60px;">Аналитика по зарплатам и городам для профессии """
+
+def report_tables(dicts, prof_name):
+    """Возвращает 3 таблицы отчета: статистику по годам, уровень зарплат по городам и долю вакансий по городам
+
+        Args:
+            dicts (list): Словари со строками и заголовками для таблиц
+            prof_name (str): Имя выбранной профессии
+
+        Returns:
+            list: [заголовки, строки] для каждой таблицы
+    """
+    dict = dicts[0]
+    years = [["Год", "Средняя зарплата", "Средняя зарплата - " + prof_name, "Количество вакансий",
+              "Количество вакансий - " + prof_name],
+             list(zip(dict[0], dict[1].values(), dict[3].values(), dict[2].values(), dict[4].values()))]
+    salaries = [["Город", "Уровень зарплат"], list(dicts[1][0].items())]
+    shares = [["Город", "Доля вакансий"],
+              [(city, str(percent * 100).replace(".", ",") + "%") for city, percent in dicts[1][1].items()]]
+    return [years, salaries, shares]
+
 class HtmlGenerator:
-    """Класс для генерации HTML страницы
+    """Класс для генерации HTML страницы. Страница собирается из частей через join или пишется в файл по частям,
+    все значения экранируются
     """
     def generate_table(self, titles, content):
         """Возвращает HTML код таблицы
@@ -464,13 +1030,11 @@ class HtmlGenerator:
 
             Returns:
                 str: HTML код таблицы
+
+        >>> HtmlGenerator().generate_table(["Город", "Доля"], [["<Москва>", 0.5]])
+        '<table><tr><th>Город</th><th>Доля</th></tr><tr><td>&lt;Москва&gt;</td><td>0.5</td></tr></table>'
         """
-        table = "<table>"
-        table += self.generate_titles(titles)
-        for row in content:
-            table += self.generate_row(row)
-        table += "</table>"
-        return table
+        return "".join(["<table>", self.generate_titles(titles)] + [self.generate_row(row) for row in content] + ["</table>"])
 
     def generate_titles(self, titles):
         """Возвращает HTML код для заголовков таблицы
@@ -481,11 +1045,7 @@ class HtmlGenerator:
             Returns:
                 str: HTML код заголовков
         """
-        string = "<tr>"
-        for title in titles:
-            string += "<th>" + title + "</th>"
-        string += "</tr>"
-        return string
+        return "<tr><th>" + "</th><th>".join(html.escape(title) for title in titles) + "</th></tr>"
 
     def generate_row(self, row):
         """Возвращает HTML код для строки таблицы
@@ -496,199 +1056,546 @@ class HtmlGenerator:
             Returns:
                 str: HTML код для строки
         """
-        string = "<tr>"
-        for row_item in row:
-            string += "<td>" + str(row_item) + "</td>"
-        string += "</tr>"
-        return string
+        return "<tr><td>" + "</td><td>".join(html.escape(str(row_item)) for row_item in row) + "</td></tr>"
 
-    def generate_html(self, dicts, image_path, prof_name):
+    @timed_stage("html")
+    def generate_html(self, dicts, image_path, prof_name, svg=None):
         """Возвращает HTML код страницы с графиками и 3-мя таблицами 
 
             Args:
                 dicts (list): Словари со строками и заголовками для таблиц
                 image_path (str): Путь до графика
                 prof_name (str): Имя выбранной профессии
+                svg (str): Графики в виде SVG, вставляются в страницу вместо ссылки на image_path
             
             Returns:
                 str: HTML код страницы
         """
-        html = """<!DOCTYPE html>
-                    <html lang="en">
-                    <head>
-                        <meta charset="UTF-8">
-                        <title>Report</title>
-                    </head>
-                    <style>
-                    body{
-                        font-family: Verdana;
-                    }
-                    table{
-                        text-align: center;
-                        border-collapse: collapse;
-                    }
-                    th, td{
-                        border: 1px solid;
-                        padding: 5px;
-                    }
-                    </style>
-                    <body>
-                    <h1 style="text-align: center; font-size: 60px;">Аналитика по зарплатам и городам для профессии """ + prof_name + """</h1>
-                    <img src=\"""" + image_path + """\">"""
-        # 1
-        titles = ["Год", "Средняя зарплата", "Средняя зарплата - " + prof_name, "Количество вакансий",
-                  "Количество вакансий - " + prof_name]
-        html += "<h1 style='text-align:center;'>Статистика по годам</h1>"
-        html += "<table style='width: 100%;'>" + self.generate_titles(titles)
-        dict = dicts[0]
-        for i in range(len(dict[0])):
-            year = dict[0][i]
-            avgSalary = list(dict[1].values())[i]
-            avgSalaryProf = list(dict[3].values())[i]
-            vacAmount = list(dict[2].values())[i]
-            vacAmountProf = list(dict[4].values())[i]
-            row = [year, avgSalary, avgSalaryProf, vacAmount, vacAmountProf]
-            html += self.generate_row(row)
-        html += """</table> <br>"""
-
-        # 2
-        titles = ["Город", "Уровень зарплат"]
-        html += "<h1 style='text-align:center;'>Статистика по городам</h1>"
-        html += "<table style='float: left; width: 45%;'>" + self.generate_titles(titles)
-        dict = dicts[1][0]
-        values = list(dict.values())
-        keys = list(dict.keys())
-        for i in range(len(values)):
-            city = keys[i]
-            avgSalary = values[i]
-            row = [city, avgSalary]
-            html += self.generate_row(row)
-        html += "</table>"
-
-        # 3
-        titles = ["Город", "Доля вакансий"]
-        html += "<table style='float: right; width: 45%;'>" + self.generate_titles(titles)
-        dict = dicts[1][1]
-        values = list(dict.values())
-        keys = list(dict.keys())
-        for i in range(len(values)):
-            city = keys[i]
-            percent = str(values[i] * 100).replace(".", ",") + "%"
-            row = [city, percent]
-            html += self.generate_row(row)
-        html += "</table></body></html>"
-        return html
+        output = io.StringIO()
+        self.write_html(output, dicts, image_path, prof_name, svg)
+        return output.getvalue()
 
-class Table:
-    """Класс для работы с таблицей.
+    def write_html(self, output, dicts, image_path, prof_name, svg=None):
+        """Пишет HTML код страницы с графиками и 3-мя таблицами в открытый файл по частям
 
-    Attributes:
-        vacancies_objects (list): Вакансии
-        input_connect (InputConect): Проверка ввода
-        fields (list): Поля таблицы
-        table (PrettyTable): Таблица
+            Args:
+                output (file): Файл, открытый на запись текста
+                dicts (list): Словари со строками и заголовками для таблиц
+                image_path (str): Путь до графика
+                prof_name (str): Имя выбранной профессии
+                svg (str): Графики в виде SVG, вставляются в страницу вместо ссылки на image_path
+        """
+        output.write(report_head + html.escape(prof_name) + """</h1>
+                    """)
+        output.write(svg if svg is not None else "<img src=\"" + html.escape(image_path) + "\">")
+        years, salaries, shares = report_tables(dicts, prof_name)
+        output.write("<h1 style='text-align:center;'>Статистика по годам</h1>")
+        output.write("<table style='width: 100%;'>" + self.generate_titles(years[0]))
+        for row in years[1]:
+            output.write(self.generate_row(row))
+        output.write("""</table> <br>""")
+
+        output.write("<h1 style='text-align:center;'>Статистика по городам</h1>")
+        output.write("<table style='float: left; width: 45%;'>" + self.generate_titles(salaries[0]))
+        for row in salaries[1]:
+            output.write(self.generate_row(row))
+        output.write("</table>")
+
+        output.write("<table style='float: right; width: 45%;'>" + self.generate_titles(shares[0]))
+        for row in shares[1]:
+            output.write(self.generate_row(row))
+        output.write("</table></body></html>")
+
+class IntervalTree:
+    """Класс для поиска интервалов, содержащих точку (центрированное дерево интервалов)
+
+        Attributes:
+            center (float): Центр узла
+            by_low (list): Интервалы узла, отсортированные по нижней границе
+            by_high (list): Интервалы узла, отсортированные по убыванию верхней границы
+            left (IntervalTree): Интервалы левее центра
+            right (IntervalTree): Интервалы правее центра
     """
-    def __init__(self, vacancies_objects : list, fields : list, input_connect : InputConect):
-        """Инициализирует объект Table
+    def __init__(self, intervals):
+        """Инициализирует объект IntervalTree
 
-        Args:
-            vacancies_objects (list): Вакансии
-            fields (list): Поля таблицы
-            input_connect (InputConect): Проверка ввода
-        """
-        self.vacancies_objects = vacancies_objects
-        self.input_connect = input_connect
-        self.fields = fields
-        self.table = PrettyTable()
-    
-    def filter(self):
-        """Вызывает функции фильтра и сортировки вакансий
+            Args:
+                intervals (list): Интервалы в виде (нижняя граница, верхняя граница, номер)
         """
-        vacancies = self.vacancies_objects
-        if input_connect.filter_parameter[0] == "Ок":
-            vacancies = self.filter_vacancies(vacancies)
-        if input_connect.sort_field[0] == "Ок":
-            vacancies = self.sort_vacancies(vacancies)
-        self.vacancies_objects = vacancies
+        points = sorted(point for interval in intervals for point in interval[:2])
+        self.center = points[len(points) // 2] if len(points) != 0 else 0
+        left = [x for x in intervals if x[1] < self.center]
+        right = [x for x in intervals if x[0] > self.center]
+        middle = [x for x in intervals if x[0] <= self.center <= x[1]]
+        self.by_low = sorted(middle, key=lambda x: x[0])
+        self.by_high = sorted(middle, key=lambda x: x[1], reverse=True)
+        self.left = IntervalTree(left) if len(left) != 0 else None
+        self.right = IntervalTree(right) if len(right) != 0 else None
+
+    def stab(self, point):
+        """Находит интервалы, содержащие точку
 
-    def fill_table(self):
-        """Полностью заполняет таблицу
-        """
-        self.table.hrules = 1
-        self.table.align = "l"
-        self.table.field_names = ['№', 'Название', 'Описание', 'Навыки', 'Опыт работы', 'Премиум-вакансия',
-                        'Компания', 'Оклад', 'Название региона', 'Дата публикации вакансии']
-        for i in range(len(self.vacancies_objects)):
-            self.table.add_row([i + 1] + self.vacancies_objects[i].to_list())
-        self.table._max_width = {'Название': 20, 'Описание': 20, 'Навыки': 20, 'Опыт работы': 20, 'Премиум-вакансия': 20,
-                        'Компания': 20, 'Оклад': 20, 'Название региона': 20, 'Дата публикации вакансии': 20}
+            Args:
+                point (float): Точка
 
-    def print_table(self):
-        """Выводит таблицу в консоль
+            Returns:
+                list: Номера интервалов
+
+        >>> sorted(IntervalTree([(1, 5, 0), (6, 8, 1), (4, 7, 2), (9, 9, 3)]).stab(5))
+        [0, 2]
         """
-        columns = self.input_connect.columns
-        start = self.input_connect.range[0]
-        end = self.input_connect.range[1]
-        print(self.table.get_string(start = start - 1, end = end - 1, fields = columns))
+        found = []
+        node = self
+        while node is not None:
+            if point < node.center:
+                for low, high, number in node.by_low:
+                    if low > point:
+                        break
+                    found.append(number)
+                node = node.left
+            elif point > node.center:
+                for low, high, number in node.by_high:
+                    if high < point:
+                        break
+                    found.append(number)
+                node = node.right
+            else:
+                found += [x[2] for x in node.by_low]
+                node = None
+        return found
 
-    def filter_vacancies(self, vacancies):
-        """Фильтрует вакансии
+class VacancyIndex:
+    """Класс для индексов по загруженным вакансиям. Индексы строятся при первом запросе к полю
+    и переиспользуются последующими запросами
+
+        Attributes:
+            vacancies (list): Вакансии
+    """
+    def __init__(self, vacancies):
+        """Инициализирует объект VacancyIndex
 
             Args:
-                vacancies (list): Вакансии 
-            
-            Returns:
-                list: Отфильтрованные вакансии
+                vacancies (list): Вакансии
         """
-        filterField = self.input_connect.filter_parameter[1].rstrip().lstrip()
-        filterParam = self.input_connect.filter_parameter[2].rstrip().lstrip()
-        if filterField == "salary_currency":
-            filterParam = get_key(currencyToRus, filterParam)
-            return list(filter(lambda vacancy: filterParam in vacancy.salary.salary_currency, vacancies))
-        elif filterField == "premium":
-            return list(filter(lambda vacancy: filterParam in vacancy.premium.lower().replace("true", "Да").replace("false", "Нет"), vacancies))
-        elif filterField == "experience_id":
-            filterParam = get_key(experienceToRus, filterParam)
-            return list(filter(lambda vacancy: filterParam in vacancy.experience_id, vacancies))
-        elif filterField == "salary":
-            return list(filter(lambda vacancy: float(vacancy.salary.salary_from) <= float(filterParam) <= float(vacancy.salary.salary_to), vacancies))
-        elif filterField == "key_skills":
-            skills = filterParam.split(", ")
-            return list(filter(lambda vacancy: self.check_skills(vacancy.key_skills, skills), vacancies))
-        elif filterField == "published_at":
-            return list(filter(lambda vacancy: vacancy.date_to_string() == filterParam, vacancies))
-        return list(filter(lambda vacancy: filterParam == getattr(vacancy, filterField), vacancies))
-
-    def sort_vacancies(self, vacancies):
-        """Сортирует вакансии
+        self.vacancies = vacancies
+        self.__hash_indexes = {}
+        self.__salary_index = None
+        self.__skills_index = None
+        self.__sort_keys = {}
+        self.__numbers = None
+
+    def filter(self, field, param):
+        """Фильтрует вакансии так же, как Table.filter_vacancies, но через индексы
 
             Args:
-                vacancies (list): Вакансии 
-            
+                field (str): Поле фильтрации
+                param (str): Параметр фильтрации
+
             Returns:
-                list: Отсортированные вакансии
+                list: Отфильтрованные вакансии в исходном порядке
         """
-        sort_field = self.input_connect.sort_field[1].rstrip().lstrip()
-        reverse_sort = self.input_connect.sort_field[2]
-        if sort_field == "Оклад":
-            vacancies = sorted(vacancies, key=lambda vacancy: (float(vacancy.salary.salary_from) * currency_to_rub[vacancy.salary.salary_currency] + float(vacancy.salary.salary_to) * currency_to_rub[vacancy.salary.salary_currency]) // 2, reverse = reverse_sort)
-        elif sort_field == "Опыт работы":
-            vacancies = sorted(vacancies, key=lambda vacancy: experienceToPoints[vacancy.experience_id], reverse = reverse_sort)
-        else:
-            sortIndex = fields.index(get_key(fieldToRus, sort_field)) 
-            if sort_field == "Навыки":
-                vacancies = sorted(vacancies, key=lambda vacancy: len(vacancy.key_skills), reverse = reverse_sort)
-            else:
-                vacancies = sorted(vacancies, key=lambda vacancy: getattr(vacancy, get_key(fieldToRus, sort_field)), reverse = reverse_sort)
-        return vacancies
+        return [self.vacancies[number] for number in self.matcher(field, param)(self)]
 
-    def check_skills(self, vacancy_skills, skills):
-        """Проверяет наличие всех требуемых навыков в вакансии
+    @staticmethod
+    def matcher(field, param):
+        """Разбирает параметр фильтрации один раз и возвращает функцию поиска по индексу
 
             Args:
-                vacancy_skills (list): Список навыков вакансии
-                skills (list): Навыки для проверки
-            
+                field (str): Поле фильтрации
+                param (str): Параметр фильтрации
+
+            Returns:
+                callable: Принимает VacancyIndex и возвращает номера подходящих вакансий по возрастанию
+        """
+        if field == "salary_currency":
+            currency = get_key(currencyToRus, param)
+            return lambda index: index.contains(field, currency)
+        elif field == "premium":
+            return lambda index: index.contains(field, param)
+        elif field == "experience_id":
+            experience = get_key(experienceToRus, param)
+            return lambda index: index.contains(field, experience)
+        elif field == "salary":
+            salary = float(param)
+            return lambda index: index.salary(salary)
+        elif field == "key_skills":
+            skills = param.split(", ")
+            return lambda index: index.skills(skills)
+        return lambda index: index.equal(field, param)
+
+    def equal(self, field, value):
+        """Находит вакансии, у которых значение поля равно value
+
+            Args:
+                field (str): Поле
+                value (str): Значение
+
+            Returns:
+                list: Номера вакансий по возрастанию
+        """
+        return self.__hash_index(field).get(value, [])
+
+    def contains(self, field, value):
+        """Находит вакансии, значение поля которых содержит value. Перебираются только различные значения поля
+
+            Args:
+                field (str): Поле
+                value (str): Подстрока
+
+            Returns:
+                list: Номера вакансий по возрастанию
+        """
+        if value is None:
+            return []
+        groups = [numbers for key, numbers in self.__hash_index(field).items() if value in key]
+        return groups[0] if len(groups) == 1 else sorted(number for numbers in groups for number in numbers)
+
+    def salary(self, value):
+        """Находит вакансии, в вилку оклада которых попадает value
+
+            Args:
+                value (float): Оклад
+
+            Returns:
+                list: Номера вакансий по возрастанию
+        """
+        if self.__salary_index is None:
+            self.__salary_index = IntervalTree([(vacancy.salary.salary_from, vacancy.salary.salary_to, number)
+                                                for number, vacancy in enumerate(self.vacancies)
+                                                if vacancy.salary.salary_from <= vacancy.salary.salary_to])
+        return sorted(self.__salary_index.stab(value))
+
+    def skills(self, skills):
+        """Находит вакансии, у которых есть все навыки
+
+            Args:
+                skills (list): Навыки
+
+            Returns:
+                list: Номера вакансий по возрастанию
+        """
+        if self.__skills_index is None:
+            self.__skills_index = {}
+            for number, vacancy in enumerate(self.vacancies):
+                for skill in set(vacancy.key_skills):
+                    self.__skills_index.setdefault(skill, []).append(number)
+        groups = sorted((self.__skills_index.get(skill, []) for skill in set(skills)), key=len)
+        if len(groups) == 0:
+            return list(range(len(self.vacancies)))
+        found = set(groups[0])
+        for numbers in groups[1:]:
+            found.intersection_update(numbers)
+        return sorted(found)
+
+    def numbers(self, vacancies):
+        """Находит номера вакансий в исходном списке
+
+            Args:
+                vacancies (list): Вакансии из исходного списка
+
+            Returns:
+                list: Номера вакансий
+        """
+        if vacancies is self.vacancies:
+            return list(range(len(self.vacancies)))
+        if self.__numbers is None:
+            self.__numbers = {id(vacancy): number for number, vacancy in enumerate(self.vacancies)}
+        return [self.__numbers[id(vacancy)] for vacancy in vacancies]
+
+    def sort_keys(self, sort_fields):
+        """Возвращает ключи сортировки всех вакансий, вычисляя их один раз на каждый набор полей
+
+            Args:
+                sort_fields (tuple): Названия полей сортировки на русском
+
+            Returns:
+                list: Ключи сортировки по номерам вакансий
+        """
+        if sort_fields not in self.__sort_keys:
+            if len(sort_fields) == 1:
+                key = self.__sort_key(sort_fields[0])
+                self.__sort_keys[sort_fields] = [key(vacancy) for vacancy in self.vacancies]
+            else:
+                self.__sort_keys[sort_fields] = list(zip(*(self.sort_keys((field,)) for field in sort_fields)))
+        return self.__sort_keys[sort_fields]
+
+    def order(self, numbers, sort_fields, reverse=False, limit=None):
+        """Сортирует номера вакансий. Если нужны только первые limit строк, вместо полной сортировки
+        выбираются limit наименьших (или наибольших) ключей. Порядок равных ключей сохраняется, как у sorted
+
+            Args:
+                numbers (list): Номера вакансий
+                sort_fields (tuple): Названия полей сортировки на русском
+                reverse (bool): Обратный порядок
+                limit (int): Сколько первых строк нужно, None - все
+
+            Returns:
+                list: Отсортированные номера вакансий
+        """
+        key = self.sort_keys(tuple(sort_fields)).__getitem__
+        if limit is not None and limit * 8 < len(numbers):
+            return (heapq.nlargest if reverse else heapq.nsmallest)(max(limit, 0), numbers, key=key)
+        return sorted(numbers, key=key, reverse=reverse)
+
+    def __sort_key(self, sort_field):
+        """Возвращает функцию, вычисляющую ключ сортировки вакансии
+
+            Args:
+                sort_field (str): Название поля сортировки на русском
+
+            Returns:
+                callable: Ключ сортировки вакансии
+        """
+        if sort_field == "Оклад":
+            return lambda vacancy: (vacancy.salary.salary_from * currency_to_rub[vacancy.salary.salary_currency] +
+                                    vacancy.salary.salary_to * currency_to_rub[vacancy.salary.salary_currency]) // 2
+        elif sort_field == "Опыт работы":
+            return lambda vacancy: experienceToPoints[vacancy.experience_id]
+        elif sort_field == "Навыки":
+            return lambda vacancy: len(vacancy.key_skills)
+        field = get_key(fieldToRus, sort_field)
+        return lambda vacancy: getattr(vacancy, field)
+
+    def __hash_index(self, field):
+        """Возвращает хэш-индекс поля, строя его при первом обращении
+
+            Args:
+                field (str): Поле
+
+            Returns:
+                dict: Значение поля и номера вакансий с этим значением
+        """
+        if field not in self.__hash_indexes:
+            key = self.__field_key(field)
+            index = {}
+            for number, vacancy in enumerate(self.vacancies):
+                index.setdefault(key(vacancy), []).append(number)
+            self.__hash_indexes[field] = index
+        return self.__hash_indexes[field]
+
+    def __field_key(self, field):
+        """Возвращает функцию, получающую значение поля вакансии в том виде, в котором по нему фильтруют
+
+            Args:
+                field (str): Поле
+
+            Returns:
+                callable: Значение поля вакансии
+        """
+        if field == "salary_currency":
+            return lambda vacancy: vacancy.salary.salary_currency
+        elif field == "premium":
+            return lambda vacancy: vacancy.premium_to_string()
+        elif field == "published_at":
+            return lambda vacancy: vacancy.date_to_string()
+        return lambda vacancy: getattr(vacancy, field)
+
+class TablePlan:
+    """Класс для скомпилированного запроса к таблице. Фильтр, сортировка и выбор столбцов разбираются один раз
+    в функции, которые затем применяются к индексам без повторного разбора ввода
+
+        Attributes:
+            input_connect (InputConect): Проверенный ввод
+            key (tuple): Ключ той части плана, от которой зависят строки результата
+            select (callable): Принимает VacancyIndex и возвращает номера отфильтрованных вакансий
+            order (callable): Принимает VacancyIndex и номера вакансий и возвращает их в порядке сортировки
+            titles (list): Выводимые столбцы
+            project (callable): Принимает вакансию и возвращает значения выводимых столбцов
+    """
+    def __init__(self, input_connect : InputConect):
+        """Инициализирует объект TablePlan. Ввод должен быть уже проверен
+
+            Args:
+                input_connect (InputConect): Проверенный ввод
+        """
+        self.input_connect = input_connect
+        self.select = self.__compile_filter(input_connect.filter_parameter)
+        self.order = self.__compile_sort(input_connect.sort_field, input_connect.range[1] - 1)
+        columns = input_connect.columns
+        self.titles = [title for title in table_columns if len(columns) == 0 or title in columns]
+        getters = [table_columns[title] for title in self.titles]
+        self.project = lambda vacancy: [getter(vacancy) for getter in getters]
+        limit = input_connect.range[1] - 1 if input_connect.sort_field[0] == "Ок" else None
+        self.key = tuple(input_connect.filter_parameter), tuple(input_connect.sort_field), limit
+
+    def execute(self, index : "VacancyIndex"):
+        """Выполняет фильтр и сортировку плана
+
+            Args:
+                index (VacancyIndex): Индексы по всем вакансиям
+
+            Returns:
+                list: Отфильтрованные и отсортированные вакансии
+        """
+        numbers = self.order(index, self.select(index))
+        return [index.vacancies[number] for number in numbers]
+
+    @staticmethod
+    def __compile_filter(filter_parameter):
+        """Возвращает функцию фильтрации по индексу
+
+            Args:
+                filter_parameter (list): Параметр фильтрации из InputConect
+
+            Returns:
+                callable: Принимает VacancyIndex и возвращает номера вакансий
+        """
+        if filter_parameter[0] != "Ок":
+            return lambda index: range(len(index.vacancies))
+        return VacancyIndex.matcher(filter_parameter[1].strip(), filter_parameter[2].strip())
+
+    @staticmethod
+    def __compile_sort(sort_field, limit):
+        """Возвращает функцию сортировки номеров вакансий
+
+            Args:
+                sort_field (list): Параметр сортировки из InputConect
+                limit (int): Сколько первых строк нужно
+
+            Returns:
+                callable: Принимает VacancyIndex и номера вакансий и возвращает отсортированные номера
+        """
+        if sort_field[0] != "Ок":
+            return lambda index, numbers: numbers
+        sort_fields = tuple(sort_field[1].strip().split(", "))
+        reverse = sort_field[2]
+        return lambda index, numbers: index.order(list(numbers), sort_fields, reverse, limit)
+
+class Table:
+    """Класс для работы с таблицей.
+
+    Attributes:
+        vacancies_objects (list): Вакансии
+        input_connect (InputConect): Проверка ввода
+        fields (list): Поля таблицы
+        table (PrettyTable): Таблица, None до вызова fill_table
+        plan (TablePlan): Скомпилированный запрос, из него берутся выводимые столбцы
+    """
+    def __init__(self, vacancies_objects : list, fields : list, input_connect : InputConect, index : VacancyIndex = None,
+                 plan : TablePlan = None):
+        """Инициализирует объект Table
+
+        Args:
+            vacancies_objects (list): Вакансии
+            fields (list): Поля таблицы
+            input_connect (InputConect): Проверка ввода
+            index (VacancyIndex): Уже построенные индексы по этим вакансиям
+            plan (TablePlan): Уже скомпилированный запрос для input_connect
+        """
+        self.vacancies_objects = vacancies_objects
+        self.input_connect = input_connect
+        self.fields = fields
+        self.table = None
+        self.index = index if index is not None else VacancyIndex(vacancies_objects)
+        self.plan = plan if plan is not None else TablePlan(input_connect)
+    
+    def filter(self):
+        """Вызывает функции фильтра и сортировки вакансий
+        """
+        vacancies = self.vacancies_objects
+        if self.input_connect.filter_parameter[0] == "Ок":
+            vacancies = self.filter_vacancies(vacancies)
+        if self.input_connect.sort_field[0] == "Ок":
+            vacancies = self.sort_vacancies(vacancies, self.input_connect.range[1] - 1)
+        self.vacancies_objects = vacancies
+
+    def output_range(self):
+        """Возвращает номера вакансий из диапазона вывода
+
+            Returns:
+                range: Номера вакансий в отфильтрованном списке
+        """
+        start = self.input_connect.range[0]
+        end = self.input_connect.range[1]
+        return range(len(self.vacancies_objects))[max(start - 1, 0):max(end - 1, 0)]
+
+    def fill_table(self):
+        """Заполняет таблицу только строками из диапазона вывода и только требуемыми столбцами
+        """
+        self.table = self.build_table(self.output_range())
+
+    def build_table(self, numbers):
+        """Создает таблицу из вакансий с указанными номерами
+
+            Args:
+                numbers (range): Номера вакансий в отфильтрованном списке
+
+            Returns:
+                PrettyTable: Таблица
+        """
+        PrettyTable = load_prettytable()
+        titles = self.plan.titles
+        table = PrettyTable()
+        table.hrules = 1
+        table.align = "l"
+        table.field_names = ['№'] + titles
+        for i in numbers:
+            table.add_row([i + 1] + self.plan.project(self.vacancies_objects[i]))
+        table._max_width = {title: 20 for title in titles}
+        return table
+
+    def pages(self, page_size=20):
+        """Постранично отрисовывает вакансии из диапазона вывода, форматируя только строки текущей страницы
+
+            Args:
+                page_size (int): Число строк на странице
+
+            Returns:
+                generator: Страницы таблицы в виде строк
+        """
+        numbers = self.output_range()
+        for start in range(0, len(numbers), page_size):
+            yield self.build_table(numbers[start:start + page_size]).get_string()
+
+    def print_table(self):
+        """Выводит таблицу в консоль
+        """
+        print(self.table.get_string())
+
+    def filter_vacancies(self, vacancies):
+        """Фильтрует вакансии. Для загруженных вакансий используются индексы, иначе проверяется каждая вакансия
+
+            Args:
+                vacancies (list): Вакансии 
+            
+            Returns:
+                list: Отфильтрованные вакансии
+        """
+        filterField = self.input_connect.filter_parameter[1].rstrip().lstrip()
+        filterParam = self.input_connect.filter_parameter[2].rstrip().lstrip()
+        if vacancies is self.index.vacancies:
+            return self.index.filter(filterField, filterParam)
+        return VacancyIndex(vacancies).filter(filterField, filterParam)
+
+    def sort_vacancies(self, vacancies, limit=None):
+        """Сортирует вакансии по одному или нескольким полям, перечисленным через запятую.
+        Ключи сортировки берутся из индекса и вычисляются один раз
+
+            Args:
+                vacancies (list): Вакансии 
+                limit (int): Сколько первых вакансий нужно, None - все
+            
+            Returns:
+                list: Отсортированные вакансии
+        """
+        sort_fields = self.input_connect.sort_field[1].rstrip().lstrip().split(", ")
+        reverse_sort = self.input_connect.sort_field[2]
+        index = self.index
+        try:
+            numbers = index.numbers(vacancies)
+        except KeyError:
+            index = VacancyIndex(vacancies)
+            numbers = index.numbers(vacancies)
+        numbers = index.order(numbers, sort_fields, reverse_sort, limit)
+        return [index.vacancies[number] for number in numbers]
+
+    def check_skills(self, vacancy_skills, skills):
+        """Проверяет наличие всех требуемых навыков в вакансии
+
+            Args:
+                vacancy_skills (list): Список навыков вакансии
+                skills (list): Навыки для проверки
+            
             Returns:
                 bool: Наличие всех требуемых навыков в вакансии
         """
@@ -697,84 +1604,837 @@ class Table:
                 return False
         return True  
 
-class Report:
-    """Класс для создания графиков
+class TableSession:
+    """Класс для нескольких запросов к таблице одного файла. Файл читается один раз, индексы сохраняются между запросами,
+    запросы компилируются в TablePlan один раз, а результаты последних планов кэшируются
+
+        Attributes:
+            file_name (str): Имя файла
+            vacancies_objects (list): Вакансии
+            fields (list): Поля csv файла
+            index (VacancyIndex): Индексы по вакансиям
+            cache_size (int): Сколько последних результатов хранить
+    """
+    def __init__(self, file_name, cache_size=32):
+        """Инициализирует объект TableSession и читает файл
+
+            Args:
+                file_name (str): Имя файла
+                cache_size (int): Сколько последних результатов хранить
+        """
+        self.file_name = file_name
+        self.vacancies_objects, self.fields = CsvWorker(file_name).сsv_reader()
+        self.index = VacancyIndex(self.vacancies_objects)
+        self.cache_size = cache_size
+        self.__results = OrderedDict()
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def compile(filter_parametr_input, sort_input, reverse_input, range_input, columns_input):
+        """Проверяет запрос и компилирует его в план. Повторный одинаковый запрос получает уже скомпилированный план
+
+            Args:
+                filter_parametr_input (str): Параметр фильтрации
+                sort_input (str): Параметр сортировки
+                reverse_input (str): Обратный порядок сортировки
+                range_input (str): Диапазон вывода
+                columns_input (str): Требуемые столбцы
+
+            Returns:
+                TablePlan: План запроса
+        """
+        return TablePlan(InputConect(filter_parametr_input, sort_input, reverse_input, range_input, columns_input))
+
+    def run(self, plan):
+        """Выполняет план. Отфильтрованные и отсортированные вакансии берутся из кэша, если план с таким ключом уже выполнялся
+
+            Args:
+                plan (TablePlan): План запроса
+
+            Returns:
+                Table: Таблица с результатом запроса, еще не заполненная
+        """
+        table = Table(self.vacancies_objects, self.fields, plan.input_connect, self.index, plan)
+        if plan.key in self.__results:
+            self.__results.move_to_end(plan.key)
+            table.vacancies_objects = self.__results[plan.key]
+        else:
+            table.vacancies_objects = plan.execute(self.index)
+            self.__results[plan.key] = table.vacancies_objects
+            if len(self.__results) > self.cache_size:
+                self.__results.popitem(last=False)
+        return table
+
+    def query(self, filter_parametr_input, sort_input, reverse_input, range_input, columns_input):
+        """Выполняет запрос и возвращает текст для вывода
+
+            Args:
+                filter_parametr_input (str): Параметр фильтрации
+                sort_input (str): Параметр сортировки
+                reverse_input (str): Обратный порядок сортировки
+                range_input (str): Диапазон вывода
+                columns_input (str): Требуемые столбцы
+
+            Returns:
+                str: Таблица или сообщение об ошибке
+        """
+        plan = self.compile(filter_parametr_input, sort_input, reverse_input, range_input, columns_input)
+        for parameter in [plan.input_connect.filter_parameter, plan.input_connect.sort_field]:
+            if parameter[0] not in ["Нет", "Ок"]:
+                return parameter[0]
+        if len(self.vacancies_objects) == 0:
+            return "Нет данных"
+        table = self.run(plan)
+        if len(table.vacancies_objects) == 0:
+            return "Ничего не найдено"
+        table.fill_table()
+        return table.table.get_string()
+
+class Report:
+    """Класс для создания графиков
+
+        Attributes:
+            filename (str): Имя файла
+            dicts (list): Данные для графиков и таблиц
+            prof_name (str): Имя выбранной профессии
+            image_path (str): Путь до файла с графиками
+            html (str): HTML код страницы, None если он не нужен или графики в SVG не рисовались
+    """
+    def __init__(self, name, dicts, prof_name, image_path=None, render=True, image_format="png", svg=None, html=True):
+        """Инициализирует объект Report, генерирует граф и создает HTML код страницы
+            Args:
+                name (str): Имя файла
+                dicts (list): Данные для графиков и таблиц
+                prof_name (str): Имя выбранной профессии
+                image_path (str): Путь до файла с графиками, по умолчанию temp.png рядом с main.py
+                render (bool): Нарисовать графики, False если они уже нарисованы, например render_graphs,
+                    или не нужны, потому что pdf рисуется без HTML
+                image_format (str): "png" для графиков в файле или "svg" для графиков внутри HTML
+                svg (str): Уже нарисованные графики в виде SVG для image_format="svg"
+                html (bool): Создать HTML код страницы, False если pdf рисуется без HTML: тогда не рисуются и графики
+        """
+        generator = HtmlGenerator()
+        parent_dir = path.dirname(path.abspath(__file__))
+        self.filename = name
+        self.dicts = dicts
+        self.prof_name = prof_name
+        self.image_path = image_path if image_path is not None else parent_dir + '/temp.png'
+        if image_format not in ["png", "svg"]:
+            raise ValueError("Неизвестный формат графиков: " + image_format)
+        if not html:
+            self.svg = None
+            self.html = None
+            return
+        if image_format == "svg":
+            self.svg = svg if svg is not None or not render else self.generate_svg(dicts, prof_name)
+            self.html = generator.generate_html(dicts, None, prof_name, self.svg) if self.svg is not None else None
+            return
+        if render:
+            self.generate_graph(dicts, prof_name)
+        self.html = generator.generate_html(dicts, path.abspath(self.image_path), prof_name)
+
+    @timed_stage("plot")
+    def generate_graph(self, dicts, prof_name):
+        """Создает и сохраняет в виде файла графики
+
+            Args:
+                dicts (list): Данные для графиков
+                prof_name (str): Имя выбранной профессии
+        """
+        render_graph(dicts, prof_name, self.image_path)
+
+    @timed_stage("plot")
+    def generate_svg(self, dicts, prof_name):
+        """Создает графики в виде SVG для вставки в HTML, без временного файла
+
+            Args:
+                dicts (list): Данные для графиков
+                prof_name (str): Имя выбранной профессии
+
+            Returns:
+                str: SVG код
+        """
+        return render_graph(dicts, prof_name)
+
+def draw_graph(figure, dicts, prof_name):
+    """Рисует графики отчета на фигуре matplotlib. Стиль должен быть задан вызывающим
+
+        Args:
+            figure (Figure): Фигура
+            dicts (list): Данные для графиков
+            prof_name (str): Имя выбранной профессии
+    """
+    np = load_numpy()
+    dictsSalary = dicts[0]
+    dictsCities = dicts[1]
+    years = dictsSalary[0]
+    x = np.arange(len(years))
+    width = 0.35
+    ax = figure.add_subplot(2, 2, 1)
+    ax.bar(x - width / 2, dictsSalary[1].values(), width, label='средняя з/п')
+    ax.bar(x + width / 2, dictsSalary[3].values(), width, label='з/п ' + prof_name)
+    ax.legend()
+    ax.set_xticks(x, years, rotation=90)
+    ax.grid(axis='y')
+    ax.set_title("Уровень зарплат по годам")
+
+    ax = figure.add_subplot(2, 2, 2)
+    ax.bar(x - width / 2, dictsSalary[2].values(), width, label='Количество вакансий')
+    ax.bar(x + width / 2, dictsSalary[4].values(), width, label='Количество вакансий\n' + prof_name)
+    ax.legend()
+    ax.set_xticks(x, years, rotation=90)
+    ax.set_title("Количество вакансий по годам")
+
+    ax = figure.add_subplot(2, 2, 3)
+    ax.barh(list(reversed(list(dictsCities[0].keys()))), list(reversed(dictsCities[0].values())), alpha=0.8, )
+    ax.set_title("Уровень зарплат по городам")
+
+    ax = figure.add_subplot(2, 2, 4)
+    ax.pie(list(dictsCities[1].values()) + [1 - sum(list(dictsCities[1].values()))],
+           labels=list(dictsCities[1].keys()) + ["Другие"])
+    ax.set_title("Доля вакансий по городам")
+    figure.subplots_adjust(wspace=0.5, hspace=0.5)
+
+def render_graph(dicts, prof_name, image_path=None, dpi=200):
+    """Рисует графики отчета через объектный API matplotlib, без общего состояния pyplot,
+    поэтому графики разных отчетов можно рисовать одновременно в разных процессах.
+    Стиль задается через глобальные rcParams, поэтому потоки одного процесса рисуют по очереди
+
+        Args:
+            dicts (list): Данные для графиков
+            prof_name (str): Имя выбранной профессии
+            image_path (str): Путь до файла с графиками, формат определяется по расширению.
+                None чтобы вернуть графики в виде SVG для вставки в HTML
+            dpi (int): Разрешение
+
+        Returns:
+            str: Путь до файла с графиками или SVG код
+    """
+    matplotlib = load_matplotlib()
+    with render_lock, matplotlib.style.context('ggplot'), matplotlib.rc_context({'font.size': 8, 'svg.fonttype': 'none'}):
+        figure = matplotlib.figure.Figure()
+        draw_graph(figure, dicts, prof_name)
+        if image_path is None:
+            svg = io.StringIO()
+            figure.savefig(svg, format="svg", bbox_inches='tight')
+            # Для вставки в HTML нужен только элемент svg, без XML заголовка и DOCTYPE
+            svg = svg.getvalue()
+            return svg[svg.index("<svg"):]
+        figure.savefig(image_path, dpi=dpi, bbox_inches='tight')
+    return image_path
+
+@timed_stage("plot")
+def render_graphs(jobs, max_workers=None, executor_type="process"):
+    """Параллельно рисует графики нескольких отчетов, каждый в свой файл
+
+        Args:
+            jobs (list): [данные для графиков, имя профессии, путь до файла или None для SVG] для каждого отчета
+            max_workers (int): Число работников, по умолчанию число ядер процессора
+            executor_type (str): "process" для пула процессов или "thread" для пула потоков
+
+        Returns:
+            list: Пути до файлов с графиками или SVG код в порядке jobs
+    """
+    if executor_type not in executors:
+        raise ValueError("Неизвестный тип пула: " + executor_type)
+    image_paths = [job[2] for job in jobs if job[2] is not None]
+    if len(set(image_paths)) != len(image_paths):
+        raise ValueError("У каждого отчета должен быть свой файл графиков")
+    if len(jobs) <= 1 or max_workers == 1:
+        return [render_graph(*job) for job in jobs]
+    with executors[executor_type](max_workers=max_workers or min(len(jobs), cpu_count())) as executor:
+        return [task_result(x) for x in [submit_task(executor, executor_type, render_graph, *job) for job in jobs]]
+
+class WkhtmltopdfBackend:
+    """Класс для сохранения отчетов в pdf через wkhtmltopdf. Несколько отчетов конвертируются одним процессом
+    wkhtmltopdf, который читает аргументы каждой конвертации из stdin
+
+        Attributes:
+            executable (str): Путь до wkhtmltopdf
+            options (list): Аргументы wkhtmltopdf для каждой конвертации
+    """
+    uses_html = True
+    windows_path = r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe'
+
+    def __init__(self, executable=None):
+        """Инициализирует объект WkhtmltopdfBackend
+
+            Args:
+                executable (str): Путь до wkhtmltopdf, по умолчанию из переменной окружения WKHTMLTOPDF,
+                    из PATH или стандартный путь установки в Windows
+        """
+        self.executable = executable if executable is not None else self.find_executable()
+        self.options = ["--quiet", "--enable-local-file-access"]
+
+    @staticmethod
+    def find_executable():
+        """Ищет wkhtmltopdf
+
+            Returns:
+                str: Путь до wkhtmltopdf или None, если он не найден
+        """
+        if os.environ.get("WKHTMLTOPDF"):
+            return os.environ["WKHTMLTOPDF"]
+        if shutil.which("wkhtmltopdf") is not None:
+            return shutil.which("wkhtmltopdf")
+        if path.isfile(WkhtmltopdfBackend.windows_path):
+            return WkhtmltopdfBackend.windows_path
+        return None
+
+    def write(self, report, pdf_name):
+        """Сохраняет отчет в pdf
+
+            Args:
+                report (Report): Отчет
+                pdf_name (str): Название pdf файла
+        """
+        self.write_many([report], [pdf_name])
+
+    @timed_stage("pdf")
+    def write_many(self, reports, pdf_names):
+        """Сохраняет отчеты в pdf, запуская wkhtmltopdf один раз на все отчеты
+
+            Args:
+                reports (list): Отчеты
+                pdf_names (list): Названия pdf файлов
+        """
+        if self.executable is None:
+            raise OSError("wkhtmltopdf не найден, укажите путь в переменной окружения WKHTMLTOPDF")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            lines = []
+            for index, (report, pdf_name) in enumerate(zip(reports, pdf_names)):
+                html_name = path.join(temp_dir, "report_" + str(index) + ".html")
+                with open(html_name, "w", encoding="utf-8") as File:
+                    File.write(report.html)
+                lines.append(" ".join(self.options + [self.quote(html_name), self.quote(path.abspath(pdf_name))]) + "\n")
+            process = subprocess.run([self.executable, "--read-args-from-stdin"], input="".join(lines),
+                                     capture_output=True, text=True, encoding="utf-8")
+        if process.returncode != 0:
+            raise OSError("wkhtmltopdf завершился с кодом " + str(process.returncode) + ": " + process.stderr.strip())
+
+    @staticmethod
+    def quote(argument):
+        """Заключает аргумент в кавычки для строки аргументов wkhtmltopdf
+
+            Args:
+                argument (str): Аргумент
+
+            Returns:
+                str: Аргумент в кавычках
+
+        >>> WkhtmltopdfBackend.quote("my reports/a.pdf")
+        '"my reports/a.pdf"'
+        """
+        return '"' + argument.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+class MatplotlibPdfBackend:
+    """Класс для сохранения отчетов в pdf средствами matplotlib, без внешних программ.
+    Первая страница - графики, вторая - таблицы
+    """
+    uses_html = False
+
+    def write(self, report, pdf_name):
+        """Сохраняет отчет в pdf
+
+            Args:
+                report (Report): Отчет
+                pdf_name (str): Название pdf файла
+        """
+        self.write_many([report], [pdf_name])
+
+    @timed_stage("pdf")
+    def write_many(self, reports, pdf_names):
+        """Сохраняет отчеты в pdf
+
+            Args:
+                reports (list): Отчеты
+                pdf_names (list): Названия pdf файлов
+        """
+        matplotlib = load_matplotlib(pdf=True)
+        for report, pdf_name in zip(reports, pdf_names):
+            with render_lock, matplotlib.style.context('ggplot'), matplotlib.rc_context({'font.size': 8}), \
+                    matplotlib.backends.backend_pdf.PdfPages(pdf_name) as pdf:
+                figure = matplotlib.figure.Figure(figsize=(8.27, 11.69))
+                figure.suptitle("Аналитика по зарплатам и городам для профессии " + report.prof_name, fontsize=12)
+                draw_graph(figure, report.dicts, report.prof_name)
+                figure.subplots_adjust(left=0.2, right=0.95)
+                pdf.savefig(figure)
+
+                figure = matplotlib.figure.Figure(figsize=(8.27, 11.69))
+                tables = report_tables(report.dicts, report.prof_name)
+                for position, (heading, (titles, rows)) in zip([211, 223, 224], zip(
+                        ["Статистика по годам", "Уровень зарплат по городам", "Доля вакансий по городам"], tables)):
+                    ax = figure.add_subplot(position)
+                    ax.axis("off")
+                    ax.set_title(heading)
+                    if len(rows) != 0:
+                        table = ax.table(cellText=[[str(x) for x in row] for row in rows], colLabels=titles, loc="upper center")
+                        table.auto_set_font_size(False)
+                        table.set_fontsize(6)
+                        table.auto_set_column_width(range(len(titles)))
+                pdf.savefig(figure)
+
+pdf_backends = {
+    "wkhtmltopdf": WkhtmltopdfBackend,
+    "matplotlib": MatplotlibPdfBackend
+}
+
+def get_pdf_backend(name=None):
+    """Возвращает способ сохранения отчетов в pdf
+
+        Args:
+            name (str): "wkhtmltopdf" или "matplotlib", по умолчанию из переменной окружения REPORT_PDF_BACKEND,
+                а если она не задана - wkhtmltopdf, когда он установлен, иначе matplotlib
+
+        Returns:
+            WkhtmltopdfBackend | MatplotlibPdfBackend: Способ сохранения
+    """
+    if name is None:
+        name = os.environ.get("REPORT_PDF_BACKEND") or ("wkhtmltopdf" if WkhtmltopdfBackend.find_executable() else "matplotlib")
+    if name not in pdf_backends:
+        raise ValueError("Неизвестный способ сохранения pdf: " + name)
+    return pdf_backends[name]()
+
+class DataSet:
+    """Класс для хранения названия файла и всех вакансий
+
+        Attributes:
+            file_name (str): Имя файла
+            vacancies_objects (list): Вакансии
+    """
+    def __init__(self, ﬁle_name: str, vacancies_objects: list):
+        """Инициализирует объект DataSet
+
+        Args:
+            ﬁle_name (str): Имя файла
+            vacancies_objects (list): Вакансии
+        """
+        self.file_name = file_name
+        self.vacancies_objects = vacancies_objects
+
+class VacancyColumns:
+    """Класс для колоночного хранения вакансий, нужных для статистики
+
+        Attributes:
+            salary_from (np.ndarray): Нижние границы вилки оклада
+            salary_to (np.ndarray): Верхние границы вилки оклада
+            currency_codes (np.ndarray): Коды валют оклада
+            currencies (list): Валюты оклада по кодам
+            area_codes (np.ndarray): Коды городов
+            areas (list): Города по кодам
+            name_codes (np.ndarray): Коды названий вакансий
+            names (list): Названия вакансий по кодам
+            years (np.ndarray): Годы публикации вакансий
+    """
+    def __init__(self, salary_from, salary_to, currency_codes, currencies, area_codes, areas, name_codes, names, years):
+        """Инициализирует объект VacancyColumns
+
+            Args:
+                salary_from (np.ndarray): Нижние границы вилки оклада
+                salary_to (np.ndarray): Верхние границы вилки оклада
+                currency_codes (np.ndarray): Коды валют оклада
+                currencies (list): Валюты оклада по кодам
+                area_codes (np.ndarray): Коды городов
+                areas (list): Города по кодам
+                name_codes (np.ndarray): Коды названий вакансий
+                names (list): Названия вакансий по кодам
+                years (np.ndarray): Годы публикации вакансий
+        """
+        self.salary_from = salary_from
+        self.salary_to = salary_to
+        self.currency_codes = currency_codes
+        self.currencies = currencies
+        self.area_codes = area_codes
+        self.areas = areas
+        self.name_codes = name_codes
+        self.names = names
+        self.years = years
+
+    def __len__(self):
+        return len(self.years)
+
+    @property
+    def year(self):
+        """Год вакансий (по последней вакансии, как и в CSVReader.get_vacancies)
+
+            Returns:
+                int: Год публикации вакансий или None для пустых колонок
+        """
+        return int(self.years[-1]) if len(self.years) != 0 else None
+
+    def rates(self):
+        """Возвращает курсы валют к рублю по кодам валют
+
+            Returns:
+                np.ndarray: Курс для каждого кода валюты
+        """
+        np = load_numpy()
+        return np.array([currency_to_rub[currency] for currency in self.currencies], dtype=np.float64)
+
+    def name_mask(self, prof_name):
+        """Отмечает вакансии, в названии которых есть имя профессии. Каждое уникальное название проверяется один раз
+
+            Args:
+                prof_name (str): Имя выбранной профессии
+
+            Returns:
+                np.ndarray: Маска вакансий выбранной профессии
+        """
+        np = load_numpy()
+        matched = np.array([prof_name in name for name in self.names], dtype=bool)
+        return matched[self.name_codes]
+
+    def name_masks(self, matcher):
+        """Отмечает вакансии сразу для нескольких профессий. Каждое уникальное название просматривается один раз
+
+            Args:
+                matcher (ProfessionMatcher): Поиск имен профессий
+
+            Returns:
+                np.ndarray: Маска размером (число вакансий, число профессий)
+        """
+        np = load_numpy()
+        matched = np.zeros((len(self.names), len(matcher.patterns)), dtype=bool)
+        for name_code, name in enumerate(self.names):
+            for index in matcher.find(name):
+                matched[name_code, index] = True
+        return matched[self.name_codes]
+
+class ColumnsBuilder:
+    """Класс для построчного заполнения VacancyColumns без создания объектов Vacancy
+
+        Attributes:
+            salary_from (array): Нижние границы вилки оклада
+            salary_to (array): Верхние границы вилки оклада
+            currency_codes (array): Коды валют оклада
+            area_codes (array): Коды городов
+            name_codes (array): Коды названий вакансий
+            years (array): Годы публикации вакансий
+    """
+    def __init__(self):
+        """Инициализирует объект ColumnsBuilder
+        """
+        self.salary_from = array("d")
+        self.salary_to = array("d")
+        self.currency_codes = array("i")
+        self.area_codes = array("i")
+        self.name_codes = array("i")
+        self.years = array("i")
+        self.__currencies = {}
+        self.__areas = {}
+        self.__names = {}
+
+    def append(self, name, salary_from, salary_to, salary_currency, area_name, published_at):
+        """Добавляет вакансию в колонки
+
+            Args:
+                name (str): Название вакансии
+                salary_from (str): Нижняя граница вилки оклада
+                salary_to (str): Верхняя граница вилки оклада
+                salary_currency (str): Валюта оклада
+                area_name (str): Город работы
+                published_at (str): Дата публикации вакансии
+        """
+        self.salary_from.append(float(salary_from))
+        self.salary_to.append(float(salary_to))
+        self.currency_codes.append(self.__currencies.setdefault(salary_currency, len(self.__currencies)))
+        self.area_codes.append(self.__areas.setdefault(area_name, len(self.__areas)))
+        self.name_codes.append(self.__names.setdefault(name, len(self.__names)))
+        self.years.append(int(published_at[:4]))
+
+    def build(self):
+        """Создает VacancyColumns из накопленных значений
+
+            Returns:
+                VacancyColumns: Колонки вакансий
+        """
+        np = load_numpy()
+        # Salary хранит границы оклада целыми, поэтому дробная часть отбрасывается
+        return VacancyColumns(np.trunc(np.frombuffer(self.salary_from, dtype=np.float64)),
+                              np.trunc(np.frombuffer(self.salary_to, dtype=np.float64)),
+                              np.frombuffer(self.currency_codes, dtype=np.intc), list(self.__currencies),
+                              np.frombuffer(self.area_codes, dtype=np.intc), list(self.__areas),
+                              np.frombuffer(self.name_codes, dtype=np.intc), list(self.__names),
+                              np.frombuffer(self.years, dtype=np.intc))
+
+class ColumnsCache:
+    """Класс для хранения разобранных csv файлов в виде .npz в папке .cache рядом с ними.
+    Кэш файла перестраивается, если у файла изменились размер и время изменения (или хэш)
 
         Attributes:
-            filename (str): Имя файла
-            html (str): HTML код страницы
+            rebuild (bool): Перестроить кэш, даже если он действителен
+            check_hash (bool): Сверять хэш содержимого вместо времени изменения
     """
-    def __init__(self, name, dicts, prof_name):
-        """Инициализирует объект Report, генерирует граф и создает HTML код страницы
+    version = 1
+
+    def __init__(self, rebuild=False, check_hash=False):
+        """Инициализирует объект ColumnsCache
+
             Args:
-                name (str): Имя файла
-                dicts (list): Данные для графиков и таблиц
-                prof_name (str): Имя выбранной профессии
+                rebuild (bool): Перестроить кэш, даже если он действителен
+                check_hash (bool): Сверять хэш содержимого вместо времени изменения
         """
-        generator = HtmlGenerator()
-        parent_dir = path.dirname(path.abspath(__file__))
-        self.filename = name
-        self.generate_graph(dicts, prof_name)
-        self.html = generator.generate_html(dicts, parent_dir + '/temp.png', prof_name)
+        self.rebuild = rebuild
+        self.check_hash = check_hash
 
-    def generate_graph(self, dicts, prof_name):
-        """Создает и сохраняет в виде файла графики
+    @staticmethod
+    def cache_path(file_name, suffix=".npz"):
+        """Возвращает путь до файла кэша для csv файла
+
+            Args:
+                file_name (str): Название csv файла
+                suffix (str): Расширение файла кэша
+
+            Returns:
+                str: Путь до файла кэша
+
+        >>> ColumnsCache.cache_path("csv/vacancies_2007.csv")
+        'csv/.cache/vacancies_2007.csv.npz'
+        """
+        return path.join(path.dirname(file_name), ".cache", path.basename(file_name) + suffix)
+
+    def fingerprint(self, file_name):
+        """Возвращает отпечаток файла, по которому проверяется действительность кэша
+
+            Args:
+                file_name (str): Название файла
+
+            Returns:
+                list: Размер файла и время изменения либо хэш содержимого
+        """
+        stat = os.stat(file_name)
+        if not self.check_hash:
+            return [stat.st_size, stat.st_mtime_ns]
+        sha1 = hashlib.sha1()
+        with open(file_name, "rb") as File:
+            for chunk in iter(lambda: File.read(1 << 20), b""):
+                sha1.update(chunk)
+        return [stat.st_size, sha1.hexdigest()]
+
+    def get_columns(self, file_name):
+        """Возвращает колонки файла из кэша или разбирает файл и сохраняет его в кэш
+
+            Args:
+                file_name (str): Название файла
+
+            Returns:
+                VacancyColumns: Колонки вакансий
+        """
+        cache_name = self.cache_path(file_name)
+        fingerprint = self.fingerprint(file_name)
+        if not self.rebuild and path.isfile(cache_name):
+            columns = self.load(cache_name, fingerprint)
+            if columns is not None:
+                profile_count("cache_hits")
+                return columns
+        columns = CSVReader().get_columns(file_name)
+        self.save(cache_name, columns, fingerprint)
+        return columns
+
+    def get_data(self, prof_name, file_name):
+        """Возвращает статистику файла для одной профессии
 
             Args:
-                dicts (list): Данные для графиков
                 prof_name (str): Имя выбранной профессии
+                file_name (str): Название файла
+
+            Returns:
+                [list, int]: Статистические данные файла и число вакансий в нем
         """
-        dictsSalary = dicts[0]
-        dictsCities = dicts[1]
-        years = dictsSalary[0]
-        plt.grid(axis='y')
-        plt.style.use('ggplot')
-        plt.rcParams.update({'font.size': 8})
-
-        x = np.arange(len(years))
-        width = 0.35
-        ax = plt.subplot(2, 2, 1)
-        ax.bar(x - width / 2, dictsSalary[1].values(), width, label='средняя з/п')
-        ax.bar(x + width / 2, dictsSalary[3].values(), width, label='з/п ' + prof_name)
-        ax.legend()
-        ax.set_xticks(x, years, rotation=90)
-        plt.title("Уровень зарплат по годам")
-
-        ax = plt.subplot(2, 2, 2)
-        ax.bar(x - width / 2, dictsSalary[2].values(), width, label='Количество вакансий')
-        ax.bar(x + width / 2, dictsSalary[4].values(), width, label='Количество вакансий\n' + prof_name)
-        ax.legend()
-        ax.set_xticks(x, years, rotation=90)
-        plt.title("Количество вакансий по годам")
-
-        plt.subplot(2, 2, 3)
-        plt.barh(list(reversed(list(dictsCities[0].keys()))), list(reversed(dictsCities[0].values())), alpha=0.8, )
-        plt.title("Уровень зарплат по городам")
-
-        plt.subplot(2, 2, 4)
-        plt.pie(list(dictsCities[1].values()) + [1 - sum(list(dictsCities[1].values()))],
-                labels=list(dictsCities[1].keys()) + ["Другие"])
-        plt.title("Доля вакансий по городам")
-        plt.subplots_adjust(wspace=0.5, hspace=0.5)
-
-        plt.savefig("temp.png", dpi=200, bbox_inches='tight')
+        datas, amount = self.get_data_many([prof_name], file_name)
+        return [datas[0], amount]
 
-class DataSet:
-    """Класс для хранения названия файла и всех вакансий
+    def get_data_many(self, prof_names, file_name):
+        """Возвращает статистику файла для нескольких профессий, используя кэш колонок
+
+            Args:
+                prof_names (list): Имена профессий
+                file_name (str): Название файла
+
+            Returns:
+                [list, int]: Статистические данные файла для каждой профессии и число вакансий в нем
+        """
+        columns = self.get_columns(file_name)
+        return [DataWorker().get_data_many(prof_names, columns), len(columns)]
+
+    @timed_stage("read")
+    def load(self, cache_name, fingerprint):
+        """Загружает колонки из файла кэша
+
+            Args:
+                cache_name (str): Путь до файла кэша
+                fingerprint (list): Текущий отпечаток csv файла
+
+            Returns:
+                VacancyColumns: Колонки вакансий или None, если кэш недействителен
+        """
+        np = load_numpy()
+        try:
+            with np.load(cache_name) as data:
+                if data["meta"].tolist() != [str(self.version)] + [str(x) for x in fingerprint]:
+                    return None
+                return VacancyColumns(data["salary_from"], data["salary_to"],
+                                      data["currency_codes"], self.__decode_strings(data["currencies"]),
+                                      data["area_codes"], self.__decode_strings(data["areas"]),
+                                      data["name_codes"], self.__decode_strings(data["names"]),
+                                      data["years"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, cache_name, columns, fingerprint):
+        """Сохраняет колонки в файл кэша. Запись атомарна, поэтому кэш безопасно строить из нескольких процессов
+
+            Args:
+                cache_name (str): Путь до файла кэша
+                columns (VacancyColumns): Колонки вакансий
+                fingerprint (list): Отпечаток csv файла
+        """
+        np = load_numpy()
+        os.makedirs(path.dirname(cache_name), exist_ok=True)
+        temp_name = cache_name + "." + str(os.getpid()) + ".tmp"
+        with open(temp_name, "wb") as File:
+            np.savez(File, meta=np.array([str(self.version)] + [str(x) for x in fingerprint]),
+                     salary_from=columns.salary_from, salary_to=columns.salary_to,
+                     currency_codes=columns.currency_codes, currencies=self.__encode_strings(columns.currencies),
+                     area_codes=columns.area_codes, areas=self.__encode_strings(columns.areas),
+                     name_codes=columns.name_codes, names=self.__encode_strings(columns.names),
+                     years=columns.years)
+        os.replace(temp_name, cache_name)
+
+    def __encode_strings(self, strings):
+        """Склеивает строки через нулевой символ в массив байт
+
+            Args:
+                strings (list): Строки
+
+            Returns:
+                np.ndarray: Массив uint8 с количеством строк в первых 8 байтах
+        """
+        np = load_numpy()
+        data = len(strings).to_bytes(8, "little") + "\0".join(strings).encode("utf-8")
+        return np.frombuffer(data, dtype=np.uint8)
+
+    def __decode_strings(self, data):
+        """Восстанавливает строки, сохраненные __encode_strings
+
+            Args:
+                data (np.ndarray): Массив uint8
+
+            Returns:
+                list: Строки
+        """
+        data = data.tobytes()
+        if int.from_bytes(data[:8], "little") == 0:
+            return []
+        return data[8:].decode("utf-8").split("\0")
+
+class DataSnapshots(ColumnsCache):
+    """Класс для хранения готовой статистики каждого файла в .stats.json в папке .cache рядом с ним.
+    Пересчитываются только файлы, которые изменились с прошлого запуска.
+    Общая статистика и статистика по городам одинаковы для всех профессий и хранятся в снимке один раз
+    """
+    snapshot_version = 2
+
+    def get_data_many(self, prof_names, file_name):
+        """Возвращает статистику файла для нескольких профессий из снимка.
+        Профессии, которых нет в снимке, считаются за один проход и дописываются в снимок
+
+            Args:
+                prof_names (list): Имена профессий
+                file_name (str): Название файла
+
+            Returns:
+                [list, int]: Статистические данные файла для каждой профессии и число вакансий в нем
+        """
+        snapshot_name = self.cache_path(file_name, ".stats.json")
+        meta = [self.version, self.snapshot_version] + self.fingerprint(file_name)
+        snapshot = {"meta": meta, "common": None, "professions": {}}
+        if not self.rebuild and path.isfile(snapshot_name):
+            try:
+                with open(snapshot_name, encoding="utf-8") as File:
+                    saved = json.load(File)
+                if saved["meta"] == meta:
+                    snapshot = saved
+            except (OSError, ValueError, KeyError):
+                pass
+        professions = snapshot["professions"]
+        missing = [prof_name for prof_name in dict.fromkeys(prof_names) if prof_name not in professions]
+        if len(missing) != 0:
+            for prof_name, data in zip(missing, super().get_data_many(missing, file_name)[0]):
+                snapshot["common"] = self.__dump_common(data)
+                professions[prof_name] = [data[3].to_list(), data[4]]
+            temp_name = snapshot_name + "." + str(os.getpid()) + ".tmp"
+            with open(temp_name, "w", encoding="utf-8") as File:
+                json.dump(snapshot, File, ensure_ascii=False, allow_nan=False)
+            os.replace(temp_name, snapshot_name)
+        profile_count("snapshot_hits", len(prof_names) - len(missing))
+        if len(prof_names) == 0:
+            return [[], 0]
+        year, salary, amount, cities_salary, cities_amount = self.__load_common(snapshot["common"])
+        datas = []
+        for prof_name in prof_names:
+            # Общие части не копируются: как и у DataWorker.get_data_many, они общие для всех профессий
+            salary_prof, amount_prof = professions[prof_name]
+            datas.append([year, salary, amount, SalaryStats.from_list(salary_prof), amount_prof, cities_salary, cities_amount])
+        return [datas, amount]
+
+    def __dump_common(self, data):
+        """Переводит общую для всех профессий часть статистики файла в вид для сохранения в JSON
+
+            Args:
+                data (list): Статистические данные из DataWorker.get_data
+
+            Returns:
+                list: [year, salary, amount, cities_salary, cities_amount] из простых типов
+        """
+        year, salary, amount, salary_prof, amount_prof, cities_salary, cities_amount = data
+        return [year, salary.to_list(), amount, {city: stats.to_list() for city, stats in cities_salary.items()}, cities_amount]
+
+    def __load_common(self, common):
+        """Восстанавливает общую часть статистики файла, сохраненную __dump_common
+
+            Args:
+                common (list): Статистические данные из простых типов
+
+            Returns:
+                list: [year, salary, amount, cities_salary, cities_amount]
+        """
+        year, salary, amount, cities_salary, cities_amount = common
+        return [year, SalaryStats.from_list(salary), amount,
+                {city: SalaryStats.from_list(stats) for city, stats in cities_salary.items()}, cities_amount]
+
+class RowDecoder:
+    """Класс для извлечения нужных полей из строки csv. Заголовок разбирается один раз,
+    после чего каждая строка разбирается одним вызовом itemgetter
 
         Attributes:
-            file_name (str): Имя файла
-            vacancies_objects (list): Вакансии
+            names (list): Извлекаемые поля
+            decode (callable): Функция, возвращающая tuple значений полей строки
     """
-    def __init__(self, ﬁle_name: str, vacancies_objects: list):
-        """Инициализирует объект DataSet
+    def __init__(self, fields, names=vacancy_fields):
+        """Инициализирует объект RowDecoder
 
-        Args:
-            ﬁle_name (str): Имя файла
-            vacancies_objects (list): Вакансии
+            Args:
+                fields (list): Заголовок csv файла
+                names (list): Извлекаемые поля
+
+        >>> RowDecoder(["salary_to", "name"], ["name", "salary_to"]).decode(["2000", "x"])
+        ('x', '2000')
+        >>> RowDecoder(["name"], ["name", "salary_currency", "area_name"]).decode(["x"])
+        ('x', 'RUR', '')
         """
-        self.file_name = file_name
-        self.vacancies_objects = vacancies_objects
+        self.names = names
+        missing = [name for name in names if name not in fields]
+        # Отсутствующие поля берутся из значений по умолчанию, дописанных в конец строки
+        indexes = [fields.index(name) if name in fields else missing.index(name) - len(missing) for name in names]
+        getter = itemgetter(*indexes)
+        if len(indexes) == 1:
+            getter = lambda row, index=indexes[0]: (row[index],)
+        if len(missing) == 0:
+            self.decode = getter
+        else:
+            padding = [field_defaults.get(name, "") for name in missing]
+            self.decode = lambda row: getter(row + padding)
 
 class CsvWorker:
     """Класс для работы с CSV файлом
@@ -796,35 +2456,26 @@ class CsvWorker:
             Returns:
                 bool: Пустой ли файл
         """
-        if os.stat(file_name).st_size == 0:
+        if os.stat(self.file_name).st_size == 0:
             print("Пустой файл")
             return False
         return True
 
-    def csv_ﬁler(self, vacancy_in, fields):
+    def csv_ﬁler(self, vacancy_in, decoder):
         """Создает вакансию, находя необходимые аттрибуты для нее
 
             Args:
                 vacancy_in (list): Вакансия в виде list
+                decoder (RowDecoder): Разборщик строк для заголовка файла
 
             Returns:
                 Vacancy: Вакансия
         """
-        name = vacancy_in[fields.index("name")] if "name" in fields else ""
-        description = vacancy_in[fields.index("description")] if "description" in fields else ""
-        key_skills = vacancy_in[fields.index("key_skills")] if "key_skills" in fields else ""
-        experience_id = vacancy_in[fields.index("experience_id")] if "experience_id" in fields else ""
-        premium = vacancy_in[fields.index("premium")] if "premium" in fields else ""
-        employer_name = vacancy_in[fields.index("employer_name")] if "employer_name" in fields else ""
-        area_name = vacancy_in[fields.index("area_name")] if "area_name" in fields else ""
-        salary_from = vacancy_in[fields.index("salary_from")] if "salary_from" in fields else ""
-        salary_to = vacancy_in[fields.index("salary_to")] if "salary_to" in fields else ""
-        salary_gross = vacancy_in[fields.index("salary_gross")] if "salary_gross" in fields else ""
-        salary_currency = vacancy_in[fields.index("salary_currency")] if "salary_currency" in fields else "RUR"
-        published_at = vacancy_in[fields.index("published_at")] if "published_at" in fields else ""
+        (name, description, key_skills, experience_id, premium, employer_name, area_name,
+            salary_from, salary_to, salary_gross, salary_currency, published_at) = decoder.decode(vacancy_in)
         salary = Salary(salary_from, salary_to, salary_gross, salary_currency)
         vacancy = Vacancy(name, description, key_skills, experience_id, premium, employer_name, salary, area_name, published_at)
-        return vacancy        
+        return vacancy
 
     def сsv_reader(self):
         """Читает файл, создает list Вакансий и list Полей
@@ -834,40 +2485,32 @@ class CsvWorker:
         """
         fields = []
         vacancies = []
-        with open(ﬁle_name, encoding="UTF-8-sig") as File:
+        with open(self.file_name, encoding="UTF-8-sig") as File:
             reader = csv.reader(File, delimiter=',')
             for row in reader:
                 if (fields == []):
                     fields = row
+                    decoder = RowDecoder(fields)
                 elif (len(fields) == len(row) and not ("" in row)):
-                    vacancies.append(self.csv_ﬁler(row, fields))
+                    vacancies.append(self.csv_ﬁler(row, decoder))
         return vacancies, fields
 
 class CSVReader:
-    def csv_ﬁler(self, vacancy_in, fields):
+    def csv_ﬁler(self, vacancy_in, decoder):
         """Создает вакансию, находя необходимые аттрибуты для нее
 
             Args:
                 vacancy_in (list): Вакансия в виде list
+                decoder (RowDecoder): Разборщик строк для заголовка файла
 
             Returns:
                 Vacancy: Вакансия
         """
-        name = vacancy_in[fields.index("name")] if "name" in fields else ""
-        description = vacancy_in[fields.index("description")] if "description" in fields else ""
-        key_skills = vacancy_in[fields.index("key_skills")] if "key_skills" in fields else ""
-        experience_id = vacancy_in[fields.index("experience_id")] if "experience_id" in fields else ""
-        premium = vacancy_in[fields.index("premium")] if "premium" in fields else ""
-        employer_name = vacancy_in[fields.index("employer_name")] if "employer_name" in fields else ""
-        area_name = vacancy_in[fields.index("area_name")] if "area_name" in fields else ""
-        salary_from = vacancy_in[fields.index("salary_from")] if "salary_from" in fields else ""
-        salary_to = vacancy_in[fields.index("salary_to")] if "salary_to" in fields else ""
-        salary_gross = vacancy_in[fields.index("salary_gross")] if "salary_gross" in fields else ""
-        salary_currency = vacancy_in[fields.index("salary_currency")] if "salary_currency" in fields else "RUR"
-        published_at = vacancy_in[fields.index("published_at")] if "published_at" in fields else ""
+        (name, description, key_skills, experience_id, premium, employer_name, area_name,
+            salary_from, salary_to, salary_gross, salary_currency, published_at) = decoder.decode(vacancy_in)
         salary = Salary(salary_from, salary_to, salary_gross, salary_currency)
         vacancy = Vacancy(name, description, key_skills, experience_id, premium, employer_name, salary, area_name, published_at)
-        return vacancy   
+        return vacancy
 
 
 
@@ -887,58 +2530,365 @@ class CSVReader:
             for row in reader:
                 if (fields == []):
                     fields = row
+                    decoder = RowDecoder(fields)
                 else:
-                    vacancy = self.csv_ﬁler(row, fields)
+                    vacancy = self.csv_ﬁler(row, decoder)
                     vacancies.append(vacancy)
                     year = vacancy.date_get_year()
             File.close()
         return [year, vacancies]
 
+    def iter_rows(self, file_name, start=None, end=None):
+        """Построчно считывает из файла только поля, нужные для статистики, не храня весь файл в памяти
+
+            Args:
+                file_name (str): Название файла
+                start (int): Начало диапазона байт из split_file_ranges, None для всего файла
+                end (int): Конец диапазона байт
+
+            Yields:
+                tuple: Название, нижняя и верхняя граница оклада, валюта, город, дата публикации
+        """
+        with open(file_name, encoding="UTF-8-sig") as File:
+            reader = csv.reader(File, delimiter=',')
+            fields = next(reader, [])
+            if start is not None:
+                reader = csv.reader(read_range_lines(file_name, start, end), delimiter=',')
+            yield from map(RowDecoder(fields, statistics_fields).decode, reader)
+
+    def get_columns(self, file_name, batch_size=4096):
+        """Считывает из файла только поля, нужные для статистики, в колоночном виде
+
+            Args:
+                file_name (str): Название файла
+                batch_size (int): Сколько строк читать за раз при включенном замере этапов
+
+            Returns:
+                VacancyColumns: Колонки вакансий
+        """
+        builder = ColumnsBuilder()
+        with open(file_name, encoding="UTF-8-sig") as File:
+            reader = csv.reader(File, delimiter=',')
+            decode = RowDecoder(next(reader, []), statistics_fields).decode
+            if profiler is None:
+                for row in reader:
+                    builder.append(*decode(row))
+            else:
+                # Строки читаются пачками, чтобы чтение и разбор csv (read) замерялись отдельно
+                # от извлечения полей и их преобразования в числа и коды (decode)
+                read_time = decode_time = 0.0
+                while True:
+                    start = time.perf_counter()
+                    rows = list(islice(reader, batch_size))
+                    read_time += time.perf_counter() - start
+                    if len(rows) == 0:
+                        break
+                    start = time.perf_counter()
+                    for row in rows:
+                        builder.append(*decode(row))
+                    decode_time += time.perf_counter() - start
+                profiler.add("read", read_time)
+                profiler.add("decode", decode_time)
+        with profile_stage("build"):
+            columns = builder.build()
+        profile_count("rows", len(columns))
+        return columns
+
+class SalaryStats:
+    """Класс для потокового накопления статистики по зарплатам без хранения самих значений
+
+        Attributes:
+            count (int): Количество значений
+            total (float): Сумма значений
+            min (float): Наименьшее значение
+            max (float): Наибольшее значение
+            m2 (float): Сумма квадратов отклонений от среднего
+    """
+    def __init__(self, count=0, total=0.0, minimum=math.inf, maximum=-math.inf, m2=0.0):
+        """Инициализирует объект SalaryStats
+
+            Args:
+                count (int): Количество значений
+                total (float): Сумма значений
+                minimum (float): Наименьшее значение
+                maximum (float): Наибольшее значение
+                m2 (float): Сумма квадратов отклонений от среднего
+        """
+        self.count = count
+        self.total = total
+        self.min = minimum
+        self.max = maximum
+        self.m2 = m2
+
+    @staticmethod
+    def from_values(values):
+        """Создает SalaryStats по массиву значений
+
+            Args:
+                values (np.ndarray): Значения
+
+            Returns:
+                SalaryStats: Статистика по значениям
+        """
+        if len(values) == 0:
+            return SalaryStats()
+        total = float(values.sum())
+        m2 = float(((values - total / len(values)) ** 2).sum())
+        return SalaryStats(len(values), total, float(values.min()), float(values.max()), m2)
+
+    @property
+    def mean(self):
+        """Среднее значение, 0 если значений нет
+
+        >>> import numpy as np
+        >>> SalaryStats.from_values(np.array([1.0, 2.0, 6.0])).mean
+        3.0
+        >>> SalaryStats().mean
+        0
+        """
+        return self.total / self.count if self.count != 0 else 0
+
+    @property
+    def variance(self):
+        """Дисперсия значений, 0 если значений нет
+
+        >>> import numpy as np
+        >>> SalaryStats.from_values(np.array([1.0, 2.0, 6.0])).variance
+        4.666666666666667
+        """
+        return self.m2 / self.count if self.count != 0 else 0
+
+    def add(self, value):
+        """Добавляет одно значение
+
+            Args:
+                value (float): Значение
+        """
+        delta = value - self.mean
+        self.count += 1
+        self.total += value
+        self.m2 += delta * (value - self.total / self.count)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """Добавляет к статистике другую статистику. Порядок объединения не влияет на результат
+
+            Args:
+                other (SalaryStats): Статистика для объединения
+
+            Returns:
+                SalaryStats: Эта же статистика после объединения
+
+        >>> import numpy as np
+        >>> x = SalaryStats.from_values(np.array([1.0, 2.0]))
+        >>> x.merge(SalaryStats.from_values(np.array([6.0]))).variance
+        4.666666666666667
+        """
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def to_list(self):
+        """Возвращает статистику в виде list для сохранения в JSON.
+        У пустой статистики min и max бесконечны, в JSON они записываются как null
+
+            Returns:
+                list: [count, total, min, max, m2]
+
+        >>> SalaryStats().to_list()
+        [0, 0.0, None, None, 0.0]
+        """
+        if self.count == 0:
+            return [self.count, self.total, None, None, self.m2]
+        return [self.count, self.total, self.min, self.max, self.m2]
+
+    @staticmethod
+    def from_list(values):
+        """Создает SalaryStats из list, полученного to_list
+
+            Args:
+                values (list): [count, total, min, max, m2]
+
+            Returns:
+                SalaryStats: Статистика
+
+        >>> SalaryStats.from_list([0, 0.0, None, None, 0.0]).min
+        inf
+        """
+        count, total, minimum, maximum, m2 = values
+        return SalaryStats(count, total, math.inf if minimum is None else minimum,
+                           -math.inf if maximum is None else maximum, m2)
+
+class ProfessionMatcher:
+    """Класс для поиска нескольких имен профессий в строке за один проход по ней (автомат Ахо — Корасик)
+
+        Attributes:
+            patterns (list): Имена профессий
+    """
+    def __init__(self, patterns):
+        """Инициализирует объект ProfessionMatcher, строит автомат переходов
+
+            Args:
+                patterns (list): Имена профессий
+        """
+        self.patterns = list(patterns)
+        goto = [{}]
+        output = [set()]
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                if char not in goto[state]:
+                    goto[state][char] = len(goto)
+                    goto.append({})
+                    output.append(set())
+                state = goto[state][char]
+            output[state].add(index)
+        fail = [0] * len(goto)
+        # Переходы строятся сразу для всех символов, чтобы при поиске не ходить по ссылкам неудач
+        self.__delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            delta = dict(self.__delta[fail[state]])
+            delta.update(goto[state])
+            self.__delta[state] = delta
+            output[state] |= output[fail[state]]
+            for char, next_state in goto[state].items():
+                fail[next_state] = self.__delta[fail[state]].get(char, 0) if state != 0 else 0
+                queue.append(next_state)
+        self.__output = [frozenset(x) for x in output]
+
+    def find(self, text):
+        """Находит профессии, имена которых встречаются в строке
+
+            Args:
+                text (str): Строка для поиска
+
+            Returns:
+                set: Индексы найденных профессий
+
+        >>> sorted(ProfessionMatcher(["Java", "Java developer", "C++", "dev"]).find("Senior Java developer (C++)"))
+        [0, 1, 2, 3]
+        >>> ProfessionMatcher(["аналитик", "тестировщик"]).find("Системный аналитик")
+        {0}
+        """
+        delta = self.__delta
+        output = self.__output
+        found = set(output[0])
+        state = 0
+        for char in text:
+            state = delta[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+        return found
+
 class DataWorker:
     """Класс для статистической обработки вакансий
     """
-    def get_data(self, prof_name, vacancies_objects):
+    def get_data(self, prof_name, columns):
         """Обрабатывает вакансии и возвращает статистические данные
 
             Args:
-                vacancies_objects (list): Список вакансий
                 prof_name (str): Имя выбранной профессии
+                columns (VacancyColumns): Колонки вакансий
             
             Returns:
-                dict: Статистические данные
+                list: Статистические данные
+        """
+        return self.get_data_many([prof_name], columns)[0]
+
+    @timed_stage("aggregate")
+    def get_data_many(self, prof_names, columns):
+        """Обрабатывает вакансии за один проход для нескольких профессий сразу.
+        Общая статистика и статистика по городам считаются один раз и общие для всех профессий
+
+            Args:
+                prof_names (list): Имена профессий
+                columns (VacancyColumns): Колонки вакансий
+
+            Returns:
+                list: Статистические данные для каждой профессии
         """
-        year = vacancies_objects[0]
-        vacancies_objects = vacancies_objects[1]
-        salary_out = []
-        amount_out = 0
-        salary_prof_out = []
-        amount_prof_out = 0
+        np = load_numpy()
+        year = columns.year
+        avg_salaries = (columns.salary_from + columns.salary_to) / 2 * columns.rates()[columns.currency_codes]
+        if len(prof_names) == 1:
+            prof_masks = columns.name_mask(prof_names[0])[:, None]
+        else:
+            prof_masks = columns.name_masks(ProfessionMatcher(prof_names))
+        # Динамика уровня зарплат и количества вакансий по годам
+        salary_out = SalaryStats.from_values(avg_salaries)
+        # Уровень зарплат и доля вакансий по городам, сгруппированные по кодам городов
+        area_codes = columns.area_codes
+        areas_count = len(columns.areas)
+        counts = np.bincount(area_codes, minlength=areas_count)
+        sums = np.bincount(area_codes, weights=avg_salaries, minlength=areas_count)
+        means = sums / np.maximum(counts, 1)
+        m2 = np.bincount(area_codes, weights=(avg_salaries - means[area_codes]) ** 2, minlength=areas_count)
+        minimums = np.full(areas_count, math.inf)
+        np.minimum.at(minimums, area_codes, avg_salaries)
+        maximums = np.full(areas_count, -math.inf)
+        np.maximum.at(maximums, area_codes, avg_salaries)
         cities_salary = {}
         cities_amount = {}
-        for vacancy in vacancies_objects:
-            avg_salary = (vacancy.salary.salary_from + vacancy.salary.salary_to) / 2 * currency_to_rub[
-                vacancy.salary.salary_currency]
-            # Динамика уровня зарплат по годам
-            salary_out += [avg_salary]
-            # Динамика количества вакансий по годам
-            amount_out += 1
-            if prof_name in vacancy.name:
-                # Динамика уровня зарплат по годам для выбранной профессии
-                salary_prof_out += [avg_salary]
-                # Динамика количества вакансий по годам для выбранной профессии
-                amount_prof_out += 1
-
-            # Уровень зарплат по городам (в порядке убывания)
-            if vacancy.area_name not in cities_salary:
-                cities_salary[vacancy.area_name] = [avg_salary]
-            else:
-                cities_salary[vacancy.area_name] += [avg_salary]
-            # Доля вакансий по городам (в порядке убывания)
-            if vacancy.area_name not in cities_amount:
-                cities_amount[vacancy.area_name] = 1
-            else:
-                cities_amount[vacancy.area_name] += 1
-        return [year, salary_out, amount_out, salary_prof_out, amount_prof_out, cities_salary, cities_amount]
+        # Коды городов выданы в порядке первого появления, поэтому порядок городов как при построчном обходе
+        for area_code, area_name in enumerate(columns.areas):
+            if counts[area_code] != 0:
+                cities_salary[area_name] = SalaryStats(int(counts[area_code]), float(sums[area_code]),
+                                                       float(minimums[area_code]), float(maximums[area_code]),
+                                                       float(m2[area_code]))
+                cities_amount[area_name] = int(counts[area_code])
+        result = []
+        for index in range(len(prof_names)):
+            # Динамика уровня зарплат и количества вакансий по годам для выбранной профессии
+            salary_prof_out = SalaryStats.from_values(avg_salaries[prof_masks[:, index]])
+            result.append([year, salary_out, salary_out.count, salary_prof_out, salary_prof_out.count, cities_salary, cities_amount])
+        return result
+
+    @timed_stage("aggregate")
+    def get_data_stream(self, prof_name, rows):
+        """Обрабатывает вакансии за один проход по потоку строк, не храня сами вакансии.
+        Строки могут относиться к разным годам
+
+            Args:
+                prof_name (str): Имя выбранной профессии
+                rows (iterable): Строки из CSVReader.iter_rows
+
+            Returns:
+                list: Статистические данные по каждому году, отсортированные по годам
+        """
+        years = {}
+        is_prof = {}
+        for name, salary_from, salary_to, salary_currency, area_name, published_at in rows:
+            avg_salary = (int(float(salary_from)) + int(float(salary_to))) / 2 * currency_to_rub[salary_currency]
+            year = int(published_at[:4])
+            if year not in years:
+                years[year] = [year, SalaryStats(), 0, SalaryStats(), 0, {}, {}]
+            data = years[year]
+            data[1].add(avg_salary)
+            data[2] += 1
+            if name not in is_prof:
+                is_prof[name] = prof_name in name
+            if is_prof[name]:
+                data[3].add(avg_salary)
+                data[4] += 1
+            cities_salary = data[5]
+            if area_name not in cities_salary:
+                cities_salary[area_name] = SalaryStats()
+                data[6][area_name] = 0
+            cities_salary[area_name].add(avg_salary)
+            data[6][area_name] += 1
+        return [years[year] for year in sorted(years)]
 
 def print_data(data, total_vacancies):
     """Обрабатывает вакансии и возвращает словари для создания таблиц, графиков и выводит данные этих словарей
@@ -954,7 +2904,7 @@ def print_data(data, total_vacancies):
     salaryDict = []
     cityDict = []
     for x in data["salary"].keys():
-        temp[x] = int(sum(data["salary"][x]) / len(data["salary"][x]))
+        temp[x] = int(data["salary"][x].mean)
     print("Динамика уровня зарплат по годам:", temp)
     salaryDict.append(list(list(data["salary"].keys())[i] for i in range(len(data["salary"].keys()))))
     salaryDict.append(temp)
@@ -962,7 +2912,7 @@ def print_data(data, total_vacancies):
     salaryDict.append(data["amount"])
     temp = {list(data["salary"].keys())[i]: 0 for i in range(len(data["salary"].keys()))}
     for x in data["salary_prof"].keys():
-        temp[x] = int(sum(data["salary_prof"][x]) / len(data["salary_prof"][x]))
+        temp[x] = int(data["salary_prof"][x].mean)
     print("Динамика уровня зарплат по годам для выбранной профессии:", temp)
     salaryDict.append(temp)
 
@@ -979,9 +2929,9 @@ def print_data(data, total_vacancies):
     if "Россия" in data["salary_city"]:
         data["salary_city"].pop("Россия")
     for x in data["salary_city"].keys():
-        percent = len(data["salary_city"][x]) / total_vacancies
+        percent = data["salary_city"][x].count / total_vacancies
         if (percent >= 0.01):
-            temp[x] = int(sum(data["salary_city"][x]) / len(data["salary_city"][x]))
+            temp[x] = int(data["salary_city"][x].mean)
     temp = dict(sorted(temp.items(), key=lambda x: x[1], reverse=True)[:10])
     print("Уровень зарплат по городам (в порядке убывания):", temp)
     cityDict.append(temp)
@@ -997,29 +2947,84 @@ def print_data(data, total_vacancies):
     cityDict.append(temp)
     return [salaryDict, cityDict]
 
-""" def main_multiprocessing(file_names, prof_name):
-    Обрабатывает и считывает вакансии в многопоточном режиме
+def read_get_data(prof_names, file_name, cache=None):
+    """Считывает файл и возвращает его статистику. Выполняется внутри потока или процесса пула
+
+        Args:
+            prof_names (list): Имена профессий
+            file_name (str): Название файла
+            cache (ColumnsCache): Кэш разобранных файлов или DataSnapshots, None чтобы всегда разбирать csv
+
+        Returns:
+            [list, int]: Статистические данные файла для каждой профессии и число вакансий в нем
+    """
+    if cache is not None:
+        return cache.get_data_many(prof_names, file_name)
+    columns = CSVReader().get_columns(file_name)
+    return [DataWorker().get_data_many(prof_names, columns), len(columns)]
+
+def read_get_data_range(prof_name, file_name, start, end):
+    """Считывает диапазон байт файла и возвращает его статистику по годам. Выполняется внутри процесса пула
 
         Args:
-            file_names(list): Названия файлов
             prof_name (str): Имя выбранной профессии
-    
-    p = Pool(cpu_count() - 1)
-    dataWorker = DataWorker()
-    csvReader = CSVReader()
-    vacancies = p.map(csvReader.get_vacancies, file_names)
-    years = p.map(partial(dataWorker.get_data, prof_name), vacancies)
+            file_name (str): Название файла
+            start (int): Начало диапазона
+            end (int): Конец диапазона
+
+        Returns:
+            list: Статистические данные диапазона по каждому году
+    """
+    return DataWorker().get_data_stream(prof_name, CSVReader().iter_rows(file_name, start, end))
+
+def combine_years(years):
+    """Объединяет статистические данные частей одного и того же года
+
+        Args:
+            years (list): Статистические данные частей в порядке следования в файле
+
+        Returns:
+            list: Статистические данные по каждому году, отсортированные по годам
+    """
+    combined = {}
+    for data in years:
+        year = data[0]
+        if year not in combined:
+            combined[year] = [year, SalaryStats(), 0, SalaryStats(), 0, {}, {}]
+        result = combined[year]
+        result[1].merge(data[1])
+        result[2] += data[2]
+        result[3].merge(data[3])
+        result[4] += data[4]
+        for city, stats in data[5].items():
+            if city not in result[5]:
+                result[5][city] = SalaryStats()
+                result[6][city] = 0
+            result[5][city].merge(stats)
+            result[6][city] += data[6][city]
+    return [combined[year] for year in sorted(combined)]
+
+@timed_stage("merge")
+def merge_data(years):
+    """Объединяет статистические данные нескольких файлов. Файлы с одним и тем же годом,
+    например выгрузки по месяцам, объединяются в один год
+
+        Args:
+            years (list): Статистические данные файлов
+
+        Returns:
+            dict: Объединенные статистические данные для print_data
+    """
+    years = combine_years(years)
     cities_salary = {}
     cities_amount = {}
-   
+
     for year in years:
         city_salary = year[5]
         for city in city_salary:
-            city = city
             if city not in cities_salary:
-                cities_salary[city] = city_salary[city]
-            else:
-                cities_salary[city] += city_salary[city]
+                cities_salary[city] = SalaryStats()
+            cities_salary[city].merge(city_salary[city])
 
         city_amount = year[6]
         for city in city_amount:
@@ -1028,76 +3033,231 @@ def print_data(data, total_vacancies):
             else:
                 cities_amount[city] += city_amount[city]
 
-    dict = {"salary": {x[0]:x[1] for x in years},
+    return {"salary": {x[0]:x[1] for x in years},
             "amount": {x[0]:x[2] for x in years},
             "salary_prof": {x[0]:x[3] for x in years},
             "amount_prof": {x[0]:x[4] for x in years},
             "salary_city": cities_salary,
             "amount_city": cities_amount}
-    options = {'enable-local-file-access': None}
-    config = pdfkit.configuration(wkhtmltopdf=r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe')
-    report = Report("graph.jpg", print_data(dict, sum(len(x[1]) for x in vacancies)), prof_name)
-    pdfkit.from_string(report.html, 'report.pdf', configuration=config, options=options) """
 
-def main_futures(file_names, prof_name):
-    """Обрабатывает и считывает вакансии в многопоточном режиме
+def collect_data(file_names, prof_name, max_workers=None, executor_type="process", cache=None):
+    """Параллельно считывает и обрабатывает файлы. Каждый работник возвращает только статистику своего файла,
+    а не список вакансий
 
         Args:
-            file_names(list): Названия файлов
+            file_names (list): Названия файлов
             prof_name (str): Имя выбранной профессии
+            max_workers (int): Число работников, по умолчанию число ядер процессора
+            executor_type (str): "process" для пула процессов или "thread" для пула потоков
+            cache (ColumnsCache): Кэш разобранных файлов или DataSnapshots, None чтобы всегда разбирать csv
+
+        Returns:
+            [dict, int]: Объединенные статистические данные и общее число вакансий
     """
-    def read_get_data(prof_name, file_name):
-        dataWorker = DataWorker()
-        csvReader = CSVReader()
-        vacancies = csvReader.get_vacancies(file_name)
-        return [dataWorker.get_data(prof_name, vacancies), len(vacancies[1])]
+    dicts, total_vacancies = collect_data_many(file_names, [prof_name], max_workers, executor_type, cache)
+    return [dicts[0], total_vacancies]
 
+def collect_data_many(file_names, prof_names, max_workers=None, executor_type="process", cache=None):
+    """Параллельно считывает и обрабатывает файлы для нескольких профессий, читая каждый файл один раз
+
+        Args:
+            file_names (list): Названия файлов
+            prof_names (list): Имена профессий
+            max_workers (int): Число работников, по умолчанию число ядер процессора
+            executor_type (str): "process" для пула процессов или "thread" для пула потоков
+            cache (ColumnsCache): Кэш разобранных файлов или DataSnapshots, None чтобы всегда разбирать csv
+
+        Returns:
+            [list, int]: Объединенные статистические данные для каждой профессии и общее число вакансий
+    """
+    if executor_type not in executors:
+        raise ValueError("Неизвестный тип пула: " + executor_type)
+    if len(prof_names) == 0:
+        raise ValueError("Не указано ни одной профессии")
+    if max_workers is None:
+        max_workers = cpu_count()
     years = []
     total_vacancies = 0
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-        queue = {executor.submit(partial(read_get_data, prof_name), file_name): file_name for file_name in file_names}
+    with executors[executor_type](max_workers=max_workers) as executor:
+        queue = {submit_task(executor, executor_type, read_get_data, prof_names, file_name, cache): file_name for file_name in file_names}
         for answer in concurrent.futures.as_completed(queue):
-            result = answer.result()
+            result = task_result(answer)
             years.append(result[0])
             total_vacancies += result[1]
-            years = sorted(years, key=lambda year: year[0])
+    years = sorted(years, key=lambda year: year[0][0])
+    return [[merge_data([year[index] for year in years]) for index in range(len(prof_names))], total_vacancies]
 
-    cities_salary = {}
-    cities_amount = {}
-   
-    for year in years:
-        city_salary = year[5]
-        for city in city_salary:
-            city = city
-            if city not in cities_salary:
-                cities_salary[city] = city_salary[city]
-            else:
-                cities_salary[city] += city_salary[city]
+def collect_stream(file_name, prof_name, max_workers=None, executor_type="process"):
+    """Считывает и обрабатывает один файл потоково, в постоянной памяти. Подходит для неразделенной по годам выгрузки.
+    Файл делится на диапазоны байт по границам записей, диапазоны обрабатываются параллельно
 
-        city_amount = year[6]
-        for city in city_amount:
-            if city not in cities_amount:
-                cities_amount[city] = city_amount[city]
-            else:
-                cities_amount[city] += city_amount[city]
+        Args:
+            file_name (str): Название файла
+            prof_name (str): Имя выбранной профессии
+            max_workers (int): Число работников, по умолчанию число ядер процессора
+            executor_type (str): "process" для пула процессов или "thread" для пула потоков
 
-    dict = {"salary": {x[0]:x[1] for x in years},
-            "amount": {x[0]:x[2] for x in years},
-            "salary_prof": {x[0]:x[3] for x in years},
-            "amount_prof": {x[0]:x[4] for x in years},
-            "salary_city": cities_salary,
-            "amount_city": cities_amount}
-    options = {'enable-local-file-access': None}
-    config = pdfkit.configuration(wkhtmltopdf=r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe')
-    report = Report("graph.jpg", print_data(dict, total_vacancies), prof_name)
-    pdfkit.from_string(report.html, 'report.pdf', configuration=config, options=options)
+        Returns:
+            [dict, int]: Объединенные статистические данные и общее число вакансий
+    """
+    if executor_type not in executors:
+        raise ValueError("Неизвестный тип пула: " + executor_type)
+    if max_workers is None:
+        max_workers = cpu_count()
+    if max_workers == 1:
+        years = DataWorker().get_data_stream(prof_name, CSVReader().iter_rows(file_name))
+    else:
+        ranges = split_file_ranges(file_name, max_workers)
+        with executors[executor_type](max_workers=max_workers) as executor:
+            parts = [submit_task(executor, executor_type, read_get_data_range, prof_name, file_name, start, end)
+                     for start, end in ranges]
+            years = [year for part in parts for year in task_result(part)]
+    return [merge_data(years), sum(year[2] for year in years)]
+
+def create_report(dict, total_vacancies, prof_name, pdf_name="report.pdf", image_path=None, data=None, image_format="png", svg=None,
+                  backend=None):
+    """Выводит статистику и сохраняет отчет в pdf файл
+
+        Args:
+            dict (dict): Объединенные статистические данные
+            total_vacancies (int): Общее число вакансий
+            prof_name (str): Имя выбранной профессии
+            pdf_name (str): Название pdf файла, None чтобы только создать отчет
+            image_path (str): Путь до файла с графиками, по умолчанию temp.png рядом с main.py
+            data (list): Результат print_data, если статистика уже выведена, а графики нарисованы в image_path
+            image_format (str): "png" для графиков в файле или "svg" для графиков внутри HTML
+            svg (str): Уже нарисованные графики в виде SVG для image_format="svg"
+            backend (WkhtmltopdfBackend | MatplotlibPdfBackend): Способ сохранения pdf, по умолчанию get_pdf_backend()
+
+        Returns:
+            Report: Отчет
+    """
+    backend = backend if backend is not None else get_pdf_backend()
+    # HTML и графики для него не нужны, если pdf рисуется без него
+    if data is None:
+        report = Report("graph.jpg", print_data(dict, total_vacancies), prof_name, image_path, True, image_format,
+                        html=backend.uses_html)
+    else:
+        report = Report("graph.jpg", data, prof_name, image_path, False, image_format, svg, backend.uses_html)
+    if pdf_name is not None:
+        backend.write(report, pdf_name)
+    return report
+
+def main_futures(file_names, prof_name, max_workers=None, executor_type="process", cache=None, image_format="png",
+                 pdf_name="report.pdf", image_path=None):
+    """Обрабатывает и считывает вакансии в многопроцессном режиме, создает отчет
+
+        Args:
+            file_names(list): Названия файлов
+            prof_name (str): Имя выбранной профессии
+            max_workers (int): Число работников, по умолчанию число ядер процессора
+            executor_type (str): "process" для пула процессов или "thread" для пула потоков
+            cache (ColumnsCache): Кэш разобранных файлов или DataSnapshots, None чтобы всегда разбирать csv
+            image_format (str): "png" для графиков в файле или "svg" для графиков внутри HTML
+            pdf_name (str): Название pdf файла
+            image_path (str): Путь до файла с графиками, по умолчанию temp.png рядом с main.py
+    """
+    create_report(*collect_data(file_names, prof_name, max_workers, executor_type, cache), prof_name, pdf_name, image_path,
+                  image_format=image_format)
+
+def report_names(prof_names):
+    """Возвращает названия файлов отчетов для профессий. Недопустимые в имени файла символы заменяются на "_",
+    а совпавшие после замены названия получают номер, чтобы отчеты не перезаписывали друг друга
+
+        Args:
+            prof_names (list): Имена профессий
+
+        Returns:
+            list: Названия файлов без расширения
+
+    >>> report_names(["C++", "C#", "Java", "C__2"])
+    ['report_C_', 'report_C__2', 'report_Java', 'report_C__2_2']
+    """
+    names = []
+    for prof_name in prof_names:
+        name = "report_" + re.sub(r"[^\w\-]+", "_", prof_name)
+        unique_name = name
+        number = 2
+        while unique_name in names:
+            unique_name = name + "_" + str(number)
+            number += 1
+        names.append(unique_name)
+    return names
+
+def main_batch(file_names, prof_names, max_workers=None, executor_type="process", cache=None, image_format="png"):
+    """Обрабатывает вакансии для нескольких профессий за один проход по файлам, создает отчет для каждой профессии
+
+        Args:
+            file_names(list): Названия файлов
+            prof_names (list): Имена профессий
+            max_workers (int): Число работников, по умолчанию число ядер процессора
+            executor_type (str): "process" для пула процессов или "thread" для пула потоков
+            cache (ColumnsCache): Кэш разобранных файлов или DataSnapshots, None чтобы всегда разбирать csv
+            image_format (str): "png" для графиков в файле или "svg" для графиков внутри HTML
+
+        Returns:
+            list: Отчеты для каждой профессии
+    """
+    dicts, total_vacancies = collect_data_many(file_names, prof_names, max_workers, executor_type, cache)
+    names = report_names(prof_names)
+    datas = []
+    for prof_name, dict in zip(prof_names, dicts):
+        print("Профессия:", prof_name)
+        datas.append(print_data(dict, total_vacancies))
+    backend = get_pdf_backend()
+    svg = image_format == "svg"
+    jobs = [[data, prof_name, None if svg else name + ".png"] for data, prof_name, name in zip(datas, prof_names, names)]
+    charts = render_graphs(jobs, max_workers, executor_type) if backend.uses_html else [job[2] for job in jobs]
+    reports = [create_report(dict, total_vacancies, prof_name, None, None if svg else chart, data, image_format,
+                             chart if svg else None, backend)
+               for dict, prof_name, name, chart, data in zip(dicts, prof_names, names, charts, datas)]
+    backend.write_many(reports, [name + ".pdf" for name in names])
+    return reports
+
+def main_stream(file_name, prof_name, max_workers=None, executor_type="process", image_format="png"):
+    """Обрабатывает один файл в потоковом режиме, создает отчет
+
+        Args:
+            file_name (str): Название файла
+            prof_name (str): Имя выбранной профессии
+            max_workers (int): Число работников, по умолчанию число ядер процессора
+            executor_type (str): "process" для пула процессов или "thread" для пула потоков
+            image_format (str): "png" для графиков в файле или "svg" для графиков внутри HTML
+    """
+    create_report(*collect_stream(file_name, prof_name, max_workers, executor_type), prof_name, image_format=image_format)
 
 if __name__ == "__main__":
-    doctest.testmod()
-    if input("Выберите программу:\n1-Ваканссии \n2-Статистикa\nВаш выбор: ") == "2":
+    if "--profile" in sys.argv:
+        enable_profiling("profile")
+        main_profile = cProfile.Profile()
+        main_profile.enable()
+    image_format = "svg" if "--svg" in sys.argv else "png"
+    program = input("Выберите программу:\n1-Ваканссии \n2-Статистикa\n3-Статистика по нескольким профессиям\n4-Сессия запросов к вакансиям\nВаш выбор: ")
+    if program == "4":
+        file_name = input("Введите название файла: ")
+        if CsvWorker(file_name).check_file():
+            session = TableSession(file_name)
+            while True:
+                filter_parametr_input = input("Введите параметр фильтрации (q - выход): ")
+                if filter_parametr_input == "q":
+                    break
+                print(session.query(filter_parametr_input, input("Введите параметр сортировки: "),
+                                    input("Обратный порядок сортировки (Да / Нет): "), input("Введите диапазон вывода: "),
+                                    input("Введите требуемые столбцы: ")))
+    elif program == "3":
         dir = input("Введите название папки: ")
+        prof_names = [x.strip() for x in input("Введите названия профессий через запятую: ").split(",") if x.strip() != ""]
+        if len(prof_names) == 0:
+            print("Не указано ни одной профессии")
+        else:
+            main_batch(list(files(dir)), prof_names, cache=DataSnapshots(rebuild="--rebuild-cache" in sys.argv), image_format=image_format)
+    elif program == "2":
+        dir = input("Введите название папки или файла: ")
         prof_name = input("Введите название профессии: ")
-        main_futures(list(files(dir)), prof_name)
+        if path.isfile(dir):
+            main_stream(dir, prof_name, image_format=image_format)
+        else:
+            main_futures(list(files(dir)), prof_name, cache=DataSnapshots(rebuild="--rebuild-cache" in sys.argv), image_format=image_format)
     else:
         file_name = input("Введите название файла: ")
         filter_parametr_input = input("Введите параметр фильтрации: ")
@@ -1116,8 +3276,18 @@ if __name__ == "__main__":
                 table.filter()
                 if len(table.vacancies_objects) == 0:
                     print("Ничего не найдено")
+                elif "--pager" in sys.argv:
+                    for page in table.pages():
+                        print(page)
+                        if input("Enter - следующая страница, q - выход: ") == "q":
+                            break
                 else:
                     table.fill_table()
                     table.print_table()
             else:
-                print("Нет данных")
\ No newline at end of file
+                print("Нет данных")
+    if profiler is not None:
+        main_profile.disable()
+        main_profile.dump_stats(path.join(profiler.profile_dir, "profile_main.prof"))
+        profiler.save(path.join(profiler.profile_dir, "stages.json"))
+        profiler.merge_profiles(path.join(profiler.profile_dir, "merged.pstats"))
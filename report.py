@@ -1,32 +1,112 @@
-def write_chunk(file_name, lines):
-    """Сохраняет файл в виде csv файла 
+import csv
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import cpu_count
+
+from main import split_file_ranges, read_range_lines
+
+
+def read_fields(file_name):
+    """Считывает заголовок csv файла
 
         Args:
             file_name (str): Название файла
-            fields (str): Поля csv файла
-            lines (str): Вакансии через \n
+
+        Returns:
+            list: Поля csv файла
+    """
+    with open(file_name, encoding="utf-8-sig", newline="") as File:
+        return next(csv.reader(File), [])
+
+
+def chunk_name(out_dir, year, suffix=""):
+    """Возвращает название файла для вакансий одного года
+
+        Args:
+            out_dir (str): Папка для файлов по годам
+            year (str): Год
+            suffix (str): Окончание названия для временных частей
+
+        Returns:
+            str: Название файла
     """
-    print("Saving", file_name)
-    with open('csv//vacancies_'+ file_name +'.csv', 'w', encoding="utf-8-sig") as f_out:
-        f_out.writelines(lines)
-        f_out.close()
-
-def сsv_chuncker(file_name):
-    csvs = {}
-    with open(file_name, 'r', encoding="utf-8-sig") as File:
-        names = File.readline()
-        for string in File:
-            year = string.split(",")[len(string.split(",")) - 1][0:4]
-            if(year in csvs.keys()):
-                csvs[year].append(string)
-            else: 
-                csvs[year] = list(names)
-
-        if len(csvs) > 0:
-            year = 2007
-            for year in csvs:
-                write_chunk(str(year), csvs[year])
-                year += 1
-
-file_name = input("Введите название файла: ")
-сsv_chuncker(file_name)
\ No newline at end of file
+    return os.path.join(out_dir, "vacancies_" + year + ".csv" + suffix)
+
+
+def write_range(file_name, start, end, fields, out_dir, suffix=""):
+    """Потоково раскладывает вакансии из диапазона байт файла по файлам годов.
+    Без suffix файлы создаются с заголовком, иначе пишутся части без заголовка для последующей склейки
+
+        Args:
+            file_name (str): Название файла
+            start (int): Начало диапазона
+            end (int): Конец диапазона
+            fields (list): Поля csv файла
+            out_dir (str): Папка для файлов по годам
+            suffix (str): Окончание названия для временных частей
+
+        Returns:
+            list: Годы, для которых были записаны вакансии
+    """
+    year_index = fields.index("published_at") if "published_at" in fields else len(fields) - 1
+    outputs = {}
+    writers = {}
+    try:
+        for row in csv.reader(read_range_lines(file_name, start, end)):
+            if len(row) <= year_index:
+                continue
+            year = row[year_index][0:4]
+            if year not in writers:
+                print("Saving", chunk_name(out_dir, year))
+                if suffix == "":
+                    outputs[year] = open(chunk_name(out_dir, year), "w", encoding="utf-8-sig", newline="", buffering=1 << 20)
+                    writers[year] = csv.writer(outputs[year], lineterminator="\n")
+                    writers[year].writerow(fields)
+                else:
+                    outputs[year] = open(chunk_name(out_dir, year, suffix), "w", encoding="utf-8", newline="", buffering=1 << 20)
+                    writers[year] = csv.writer(outputs[year], lineterminator="\n")
+            writers[year].writerow(row)
+    finally:
+        for output in outputs.values():
+            output.close()
+    return list(writers)
+
+
+def сsv_chuncker(file_name, out_dir="csv", processes=1):
+    """Разделяет выгрузку на файлы по годам, не держа ее в памяти.
+    При processes > 1 файл делится на диапазоны байт, которые разбираются в отдельных процессах
+
+        Args:
+            file_name (str): Название файла
+            out_dir (str): Папка для файлов по годам
+            processes (int): Число процессов
+
+        Returns:
+            list: Годы, для которых созданы файлы
+    """
+    fields = read_fields(file_name)
+    ranges = split_file_ranges(file_name, processes)
+    if len(ranges) <= 1:
+        return sorted(write_range(file_name, *ranges[0], fields, out_dir)) if ranges else []
+
+    suffixes = [".part" + str(index) for index in range(len(ranges))]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        parts = list(executor.map(write_range, [file_name] * len(ranges), [x[0] for x in ranges], [x[1] for x in ranges],
+                                  [fields] * len(ranges), [out_dir] * len(ranges), suffixes))
+    years = sorted(set(year for part in parts for year in part))
+    for year in years:
+        with open(chunk_name(out_dir, year), "w", encoding="utf-8-sig", newline="") as f_out:
+            csv.writer(f_out, lineterminator="\n").writerow(fields)
+            f_out.flush()
+            for suffix, part in zip(suffixes, parts):
+                if year in part:
+                    with open(chunk_name(out_dir, year, suffix), "rb") as f_part:
+                        shutil.copyfileobj(f_part, f_out.buffer)
+                    os.remove(chunk_name(out_dir, year, suffix))
+    return years
+
+
+if __name__ == "__main__":
+    file_name = input("Введите название файла: ")
+    сsv_chuncker(file_name, processes=cpu_count())
@@ -1,5 +1,30 @@
-from unittest import TestCase
-from main import Salary, Vacancy
+import csv
+import doctest
+import json
+import re
+import os
+import shutil
+import sys
+import tempfile
+from unittest import TestCase, mock
+import numpy as np
+import main
+from main import TextEditor, Salary, Vacancy, CSVReader, DataWorker, SalaryStats, RowDecoder, ColumnsCache, DataSnapshots, \
+    ProfessionMatcher, collect_data, collect_data_many, report_names, collect_stream, files, split_file_ranges, read_range_lines, \
+    merge_data, print_data, create_report, main_batch, HtmlGenerator, WkhtmltopdfBackend, MatplotlibPdfBackend, get_pdf_backend, render_graph, render_graphs, Report, enable_profiling, disable_profiling, IntervalTree, VacancyIndex, InputConect, Table, TableSession, currency_to_rub
+from report import сsv_chuncker
+from benchmark import generate_dataset, write_synthetic, find_regressions, loaded_modules, bench_startup
+
+CSV_SAMPLE = ("name,salary_from,salary_to,salary_currency,area_name,published_at\n"
+              "Программист,100.0,200.5,RUR,Москва,2007-12-03T17:40:09+0300\n"
+              "Аналитик,10.0,20.0,EUR,Казань,2007-12-04T17:40:09+0300\n"
+              "\"Программист C, C++\",300.0,500.0,RUR,Москва,2007-12-05T17:40:09+0300\n")
+
+def write_sample(text=CSV_SAMPLE):
+    file = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8-sig")
+    file.write(text)
+    file.close()
+    return file.name
 
 class SalaryTests(TestCase):
     def test_salary_type(self):
@@ -72,4 +97,928 @@ class VacancyTest(TestCase):
     def test_vacancy_experience_to_list(self):
         self.assertEqual(Vacancy("x", "<br><b>x</b>yz</br>", 'z', "between3And6", "true", "x", Salary("100", "2000", "true", "RUR"), "x",
                                  "2007-12-03T17:40:09+0300").to_list(),
-        ['x', 'xyz', 'z', 'От 3 до 6 лет', 'Да', 'x', '100 - 2 000 (Рубли) (Без вычета налогов)', 'x', '03.12.2007'])
\ No newline at end of file
+        ['x', 'xyz', 'z', 'От 3 до 6 лет', 'Да', 'x', '100 - 2 000 (Рубли) (Без вычета налогов)', 'x', '03.12.2007'])
+
+class VacancyLazyTests(TestCase):
+    def create_vacancy(self):
+        return Vacancy("x", "<b>x</b> y", 'a\nb', "noExperience", "true", "x", Salary("100", "2000", "true", "RUR"), "x",
+                       "2007-12-03T17:40:09+0300")
+
+    def test_vacancy_slots(self):
+        self.assertFalse(hasattr(self.create_vacancy(), "__dict__"))
+        self.assertFalse(hasattr(Salary("100", "2000", "true", "RUR"), "__dict__"))
+
+    def test_vacancy_description_cached(self):
+        vacancy = self.create_vacancy()
+        self.assertIs(vacancy.description, vacancy.description)
+
+    def test_vacancy_key_skills_cached(self):
+        vacancy = self.create_vacancy()
+        self.assertIs(vacancy.key_skills, vacancy.key_skills)
+
+    def test_vacancy_description_setter(self):
+        vacancy = self.create_vacancy()
+        vacancy.description = "z"
+        self.assertEqual(vacancy.to_list()[1], "z")
+
+class VacancyColumnsTests(TestCase):
+    def setUp(self):
+        self.file_name = write_sample()
+        self.columns = CSVReader().get_columns(self.file_name)
+
+    def tearDown(self):
+        os.remove(self.file_name)
+
+    def test_columns_len(self):
+        self.assertEqual(len(self.columns), 3)
+
+    def test_columns_year(self):
+        self.assertEqual(self.columns.year, 2007)
+
+    def test_columns_salary_truncated(self):
+        self.assertEqual(self.columns.salary_to.tolist(), [200, 20, 500])
+
+    def test_columns_categories(self):
+        self.assertEqual(self.columns.areas, ["Москва", "Казань"])
+        self.assertEqual(self.columns.area_codes.tolist(), [0, 1, 0])
+        self.assertEqual([self.columns.currencies[x] for x in self.columns.currency_codes], ["RUR", "EUR", "RUR"])
+
+    def test_columns_name_mask(self):
+        self.assertEqual(self.columns.name_mask("Программист").tolist(), [True, False, True])
+
+    def test_get_data(self):
+        data = DataWorker().get_data("Программист", self.columns)
+        self.assertEqual(data[0], 2007)
+        self.assertEqual(data[1].total, 150.0 + 15.0 * 59.90 + 400.0)
+        self.assertEqual([data[2], data[3].mean, data[4]], [3, 275.0, 2])
+        self.assertEqual({x: y.mean for x, y in data[5].items()}, {"Москва": 275.0, "Казань": 15.0 * 59.90})
+        self.assertEqual(data[6], {"Москва": 2, "Казань": 1})
+
+class CollectDataTests(TestCase):
+    def setUp(self):
+        self.file_names = [write_sample(), write_sample(CSV_SAMPLE.replace("2007-", "2008-"))]
+
+    def tearDown(self):
+        for file_name in self.file_names:
+            os.remove(file_name)
+
+    def check_data(self, executor_type):
+        data, total_vacancies = collect_data(self.file_names, "Программист", 2, executor_type)
+        self.assertEqual(total_vacancies, 6)
+        self.assertEqual(data["amount"], {2007: 3, 2008: 3})
+        self.assertEqual(data["amount_prof"], {2007: 2, 2008: 2})
+        self.assertEqual(data["amount_city"], {"Москва": 4, "Казань": 2})
+        self.assertEqual(data["salary_city"]["Москва"].count, 4)
+
+    def test_collect_data_process(self):
+        self.check_data("process")
+
+    def test_collect_data_thread(self):
+        self.check_data("thread")
+
+    def test_collect_data_same_year(self):
+        lines = CSV_SAMPLE.splitlines(True)
+        parts = [write_sample(lines[0] + lines[1]), write_sample(lines[0] + "".join(lines[2:]))]
+        try:
+            data, total_vacancies = collect_data(parts + self.file_names[1:], "Программист", 1, "thread")
+        finally:
+            for file_name in parts:
+                os.remove(file_name)
+        expected = collect_data(self.file_names, "Программист", 1, "thread")
+        self.assertEqual(total_vacancies, 6)
+        self.assertEqual(print_data(data, total_vacancies), print_data(*expected))
+        self.assertEqual(data["amount"], {2007: 3, 2008: 3})
+        self.assertEqual(data["amount_prof"], {2007: 2, 2008: 2})
+
+    def test_collect_data_unknown_executor(self):
+        with self.assertRaises(ValueError):
+            collect_data(self.file_names, "Программист", 1, "fiber")
+
+class SalaryStatsTests(TestCase):
+    values = [100.0, 250.0, 40.0, 1000.0, 75.5]
+
+    def test_salary_stats_add(self):
+        stats = SalaryStats()
+        for value in self.values:
+            stats.add(value)
+        self.assertEqual([stats.count, stats.total, stats.min, stats.max], [5, 1465.5, 40.0, 1000.0])
+        self.assertAlmostEqual(stats.variance, np.var(self.values))
+
+    def test_salary_stats_merge(self):
+        left = SalaryStats.from_values(np.array(self.values[:2]))
+        right = SalaryStats.from_values(np.array(self.values[2:]))
+        stats = SalaryStats().merge(right).merge(left)
+        self.assertEqual([stats.count, stats.total, stats.min, stats.max], [5, 1465.5, 40.0, 1000.0])
+        self.assertAlmostEqual(stats.variance, np.var(self.values))
+
+    def test_salary_stats_merge_empty(self):
+        stats = SalaryStats.from_values(np.array(self.values)).merge(SalaryStats())
+        self.assertEqual(stats.mean, 293.1)
+
+    def test_salary_stats_empty(self):
+        self.assertEqual(SalaryStats.from_values(np.array([])).mean, 0)
+
+class StreamDataTests(TestCase):
+    def setUp(self):
+        self.file_name = write_sample(CSV_SAMPLE + CSV_SAMPLE.split("\n", 1)[1].replace("2007-", "2008-"))
+
+    def tearDown(self):
+        os.remove(self.file_name)
+
+    def test_iter_rows(self):
+        rows = CSVReader().iter_rows(self.file_name)
+        self.assertEqual(next(rows), ("Программист", "100.0", "200.5", "RUR", "Москва", "2007-12-03T17:40:09+0300"))
+        self.assertEqual(len(list(rows)), 5)
+
+    def test_get_data_stream_years(self):
+        years = DataWorker().get_data_stream("Программист", CSVReader().iter_rows(self.file_name))
+        self.assertEqual([year[0] for year in years], [2007, 2008])
+        self.assertEqual([year[2] for year in years], [3, 3])
+        self.assertEqual([year[4] for year in years], [2, 2])
+
+    def test_get_data_stream_equals_get_data(self):
+        year = DataWorker().get_data_stream("Программист", CSVReader().iter_rows(self.file_name))[0]
+        sample = write_sample()
+        columns = CSVReader().get_columns(sample)
+        os.remove(sample)
+        data = DataWorker().get_data("Программист", columns)
+        self.assertEqual(year[1].total, data[1].total)
+        self.assertEqual(year[3].total, data[3].total)
+        self.assertEqual({x: y.total for x, y in year[5].items()}, {x: y.total for x, y in data[5].items()})
+        self.assertEqual(year[6], data[6])
+
+    def test_collect_stream(self):
+        data, total_vacancies = collect_stream(self.file_name, "Программист", 1)
+        self.assertEqual(total_vacancies, 6)
+        self.assertEqual(data["amount"], {2007: 3, 2008: 3})
+        self.assertEqual(data["amount_city"], {"Москва": 4, "Казань": 2})
+
+    def test_collect_stream_ranges(self):
+        data, total_vacancies = collect_stream(self.file_name, "Программист", 1)
+        for max_workers in [2, 3, 6]:
+            ranges_data, ranges_total = collect_stream(self.file_name, "Программист", max_workers)
+            self.assertEqual(ranges_total, total_vacancies)
+            self.assertEqual(ranges_data["amount"], data["amount"])
+            self.assertEqual(ranges_data["amount_prof"], data["amount_prof"])
+            self.assertEqual(ranges_data["amount_city"], data["amount_city"])
+            self.assertEqual({x: y.total for x, y in ranges_data["salary_city"].items()},
+                             {x: y.total for x, y in data["salary_city"].items()})
+
+    def test_iter_rows_range(self):
+        rows = []
+        for start, end in split_file_ranges(self.file_name, 4):
+            rows += list(CSVReader().iter_rows(self.file_name, start, end))
+        self.assertEqual(rows, list(CSVReader().iter_rows(self.file_name)))
+
+class RowDecoderTests(TestCase):
+    def test_row_decoder_order(self):
+        decoder = RowDecoder(["area_name", "name", "salary_to"], ["name", "salary_to", "area_name"])
+        self.assertEqual(decoder.decode(["Москва", "x", "100"]), ("x", "100", "Москва"))
+
+    def test_row_decoder_defaults(self):
+        decoder = RowDecoder(["name", "area_name"])
+        values = dict(zip(decoder.names, decoder.decode(["x", "Москва"])))
+        self.assertEqual([values["name"], values["area_name"], values["salary_currency"], values["premium"]], ["x", "Москва", "RUR", ""])
+
+    def test_row_decoder_single_field(self):
+        self.assertEqual(RowDecoder(["a", "name"], ["name"]).decode(["1", "x"]), ("x",))
+
+class ColumnsCacheTests(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.file_name = os.path.join(self.dir, "vacancies.csv")
+        with open(self.file_name, "w", encoding="utf-8-sig") as file:
+            file.write(CSV_SAMPLE)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def cache_mtime(self):
+        return os.stat(ColumnsCache.cache_path(self.file_name)).st_mtime_ns
+
+    def test_cache_created(self):
+        columns = ColumnsCache().get_columns(self.file_name)
+        self.assertTrue(os.path.isfile(ColumnsCache.cache_path(self.file_name)))
+        self.assertEqual(len(columns), 3)
+
+    def test_cache_loaded(self):
+        ColumnsCache().get_columns(self.file_name)
+        mtime = self.cache_mtime()
+        columns = ColumnsCache().get_columns(self.file_name)
+        self.assertEqual(self.cache_mtime(), mtime)
+        self.assertEqual(columns.names, ["Программист", "Аналитик", "Программист C, C++"])
+        self.assertEqual(columns.areas, ["Москва", "Казань"])
+        self.assertEqual(columns.salary_to.tolist(), [200, 20, 500])
+
+    def test_cache_invalidated(self):
+        ColumnsCache().get_columns(self.file_name)
+        with open(self.file_name, "a", encoding="utf-8") as file:
+            file.write("Тестировщик,1.0,2.0,RUR,Омск,2007-12-06T17:40:09+0300\n")
+        self.assertEqual(len(ColumnsCache().get_columns(self.file_name)), 4)
+
+    def test_cache_hash(self):
+        ColumnsCache(check_hash=True).get_columns(self.file_name)
+        mtime = self.cache_mtime()
+        os.utime(self.file_name, ns=(0, 0))
+        ColumnsCache(check_hash=True).get_columns(self.file_name)
+        self.assertEqual(self.cache_mtime(), mtime)
+
+    def test_cache_rebuild(self):
+        ColumnsCache().get_columns(self.file_name)
+        os.utime(ColumnsCache.cache_path(self.file_name), ns=(0, 0))
+        ColumnsCache(rebuild=True).get_columns(self.file_name)
+        self.assertNotEqual(self.cache_mtime(), 0)
+
+    def test_cache_not_listed_as_input(self):
+        ColumnsCache().get_columns(self.file_name)
+        self.assertEqual(list(files(self.dir)), [self.dir + "/vacancies.csv"])
+
+class DataSnapshotsTests(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.file_name = os.path.join(self.dir, "vacancies.csv")
+        with open(self.file_name, "w", encoding="utf-8-sig") as file:
+            file.write(CSV_SAMPLE)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def snapshot_mtime(self):
+        return os.stat(ColumnsCache.cache_path(self.file_name, ".stats.json")).st_mtime_ns
+
+    def test_snapshot_equals_data(self):
+        data, amount = DataSnapshots().get_data("Программист", self.file_name)
+        loaded, loaded_amount = DataSnapshots().get_data("Программист", self.file_name)
+        self.assertEqual([amount, loaded_amount], [3, 3])
+        self.assertEqual(loaded[0], 2007)
+        self.assertEqual(loaded[1].to_list(), data[1].to_list())
+        self.assertEqual(loaded[3].to_list(), data[3].to_list())
+        self.assertEqual({x: y.to_list() for x, y in loaded[5].items()}, {x: y.to_list() for x, y in data[5].items()})
+        self.assertEqual(loaded[6], data[6])
+
+    def test_snapshot_reused(self):
+        DataSnapshots().get_data("Программист", self.file_name)
+        mtime = self.snapshot_mtime()
+        DataSnapshots().get_data("Программист", self.file_name)
+        self.assertEqual(self.snapshot_mtime(), mtime)
+
+    def test_snapshot_professions(self):
+        DataSnapshots().get_data("Программист", self.file_name)
+        self.assertEqual(DataSnapshots().get_data("Аналитик", self.file_name)[0][4], 1)
+        with open(ColumnsCache.cache_path(self.file_name, ".stats.json"), encoding="utf-8") as file:
+            self.assertEqual(sorted(json.load(file)["professions"]), ["Аналитик", "Программист"])
+
+    def test_snapshot_empty_profession(self):
+        data = DataSnapshots().get_data("Тестировщик", self.file_name)[0]
+        with open(ColumnsCache.cache_path(self.file_name, ".stats.json"), encoding="utf-8") as file:
+            text = file.read()
+        self.assertNotIn("Infinity", text)
+        self.assertEqual(json.loads(text)["professions"]["Тестировщик"], [[0, 0.0, None, None, 0.0], 0])
+        loaded = DataSnapshots().get_data("Тестировщик", self.file_name)[0]
+        self.assertEqual([loaded[3].min, loaded[3].max], [data[3].min, data[3].max])
+
+    def test_snapshot_cities_stored_once(self):
+        DataSnapshots().get_data_many(["Программист", "Аналитик"], self.file_name)
+        with open(ColumnsCache.cache_path(self.file_name, ".stats.json"), encoding="utf-8") as file:
+            snapshot = json.load(file)
+        self.assertEqual(sorted(snapshot["common"][3]), ["Казань", "Москва"])
+        self.assertEqual(snapshot["professions"]["Аналитик"], [[1, 15.0 * currency_to_rub["EUR"], 15.0 * currency_to_rub["EUR"],
+                                                                15.0 * currency_to_rub["EUR"], 0.0], 1])
+
+    def test_snapshot_invalidated(self):
+        DataSnapshots().get_data("Программист", self.file_name)
+        with open(self.file_name, "a", encoding="utf-8") as file:
+            file.write("Программист,1.0,2.0,RUR,Омск,2007-12-06T17:40:09+0300\n")
+        data, amount = DataSnapshots().get_data("Программист", self.file_name)
+        self.assertEqual([amount, data[4]], [4, 3])
+
+class ProfessionMatcherTests(TestCase):
+    patterns = ["Программист", "программист", "Java", "Java developer", "1С", "С", "ер"]
+    names = ["Программист 1С", "Senior Java developer", "Ведущий программист Java", "Водитель", "", "ССС"]
+
+    def test_matcher_equals_substring_search(self):
+        matcher = ProfessionMatcher(self.patterns)
+        for name in self.names:
+            expected = {index for index, pattern in enumerate(self.patterns) if pattern in name}
+            self.assertEqual(matcher.find(name), expected)
+
+    def test_matcher_empty_pattern(self):
+        self.assertEqual(ProfessionMatcher(["", "x"]).find("abc"), {0})
+
+class DataManyTests(TestCase):
+    prof_names = ["Программист", "Аналитик", "C++"]
+
+    def setUp(self):
+        self.file_name = write_sample()
+
+    def tearDown(self):
+        os.remove(self.file_name)
+
+    def test_get_data_many_equals_get_data(self):
+        columns = CSVReader().get_columns(self.file_name)
+        datas = DataWorker().get_data_many(self.prof_names, columns)
+        for prof_name, data in zip(self.prof_names, datas):
+            single = DataWorker().get_data(prof_name, columns)
+            self.assertEqual(data[3].to_list(), single[3].to_list())
+            self.assertEqual(data[4], single[4])
+        self.assertEqual([data[4] for data in datas], [2, 1, 1])
+
+    def test_collect_data_many(self):
+        dicts, total_vacancies = collect_data_many([self.file_name], self.prof_names, 1, "thread")
+        self.assertEqual(total_vacancies, 3)
+        self.assertEqual([x["amount_prof"] for x in dicts], [{2007: 2}, {2007: 1}, {2007: 1}])
+        self.assertEqual([x["amount"] for x in dicts], [{2007: 3}] * 3)
+
+    def test_collect_data_many_empty(self):
+        with self.assertRaises(ValueError):
+            collect_data_many([self.file_name], [], 1, "thread")
+
+    def test_report_names_unique(self):
+        names = report_names(["C++", "C#", "C++", "Java"])
+        self.assertEqual(len(set(names)), 4)
+        self.assertEqual(names[0], "report_C_")
+        self.assertEqual(names[3], "report_Java")
+
+MULTILINE_SAMPLE = ("name,description,published_at\n"
+                    "a,\"x\ny, \"\"z\"\"\n\",2007-01-01T00:00:00+0300\n"
+                    "b,\"\n\n\",2008-01-01T00:00:00+0300\n"
+                    "c,plain,2007-01-02T00:00:00+0300\n"
+                    "d,\"q,\nq\",2009-01-01T00:00:00+0300\n")
+
+class FileRangesTests(TestCase):
+    def setUp(self):
+        self.file_name = write_sample(MULTILINE_SAMPLE)
+
+    def tearDown(self):
+        os.remove(self.file_name)
+
+    def test_ranges_keep_records(self):
+        for parts in range(1, 12):
+            rows = []
+            for start, end in split_file_ranges(self.file_name, parts, block_size=3):
+                rows += list(csv.reader(read_range_lines(self.file_name, start, end)))
+            self.assertEqual([row[0] for row in rows], ["a", "b", "c", "d"])
+            self.assertEqual(rows[0][1], 'x\ny, "z"\n')
+
+    def test_ranges_stray_quote(self):
+        file_name = write_sample("name,description,published_at\n" + "Монитор 27\" инженер,x,2007-01-01\n" +
+                                 "".join("n" + str(i) + ",\"q\nq\",2008-01-01\n" for i in range(20)))
+        try:
+            for block_size in [3, 1 << 20]:
+                ranges = split_file_ranges(file_name, 4, block_size)
+                self.assertEqual(len(ranges), 4)
+                rows = []
+                for start, end in ranges:
+                    rows += list(csv.reader(read_range_lines(file_name, start, end)))
+                self.assertEqual([row[0] for row in rows], ["Монитор 27\" инженер"] + ["n" + str(i) for i in range(20)])
+                self.assertTrue(all(row[1] == "q\nq" for row in rows[1:]))
+        finally:
+            os.remove(file_name)
+
+    def test_ranges_cover_file(self):
+        ranges = split_file_ranges(self.file_name, 3)
+        self.assertEqual(ranges[-1][1], os.path.getsize(self.file_name))
+        self.assertEqual([x[1] for x in ranges[:-1]], [x[0] for x in ranges[1:]])
+
+class ChunkerTests(TestCase):
+    def setUp(self):
+        self.file_name = write_sample(MULTILINE_SAMPLE)
+        self.dirs = [tempfile.mkdtemp(), tempfile.mkdtemp()]
+
+    def tearDown(self):
+        os.remove(self.file_name)
+        for dir in self.dirs:
+            shutil.rmtree(dir)
+
+    def read_year(self, dir, year):
+        with open(os.path.join(dir, "vacancies_" + year + ".csv"), encoding="utf-8-sig") as file:
+            return list(csv.reader(file))
+
+    def test_chunker_years(self):
+        self.assertEqual(сsv_chuncker(self.file_name, self.dirs[0]), ["2007", "2008", "2009"])
+        rows = self.read_year(self.dirs[0], "2007")
+        self.assertEqual([row[0] for row in rows], ["name", "a", "c"])
+        self.assertEqual(rows[1][1], 'x\ny, "z"\n')
+
+    def test_chunker_parallel(self):
+        сsv_chuncker(self.file_name, self.dirs[0])
+        сsv_chuncker(self.file_name, self.dirs[1], 3)
+        self.assertEqual(sorted(os.listdir(self.dirs[0])), sorted(os.listdir(self.dirs[1])))
+        for year in ["2007", "2008", "2009"]:
+            self.assertEqual(self.read_year(self.dirs[0], year), self.read_year(self.dirs[1], year))
+
+class ColumnsReadTests(TestCase):
+    def read_columns(self, text):
+        file_name = write_sample(text)
+        try:
+            return CSVReader().get_columns(file_name)
+        finally:
+            os.remove(file_name)
+
+    def test_columns_multiline(self):
+        text = "name,salary_from,salary_to,area_name,published_at\n\"a\nb\",1,2,\"Москва\",2007-01-01\nc,3,4,Омск,2008-01-01"
+        columns = self.read_columns(text)
+        self.assertEqual(columns.names, ["a\nb", "c"])
+        self.assertEqual(columns.currencies, ["RUR"])
+
+    def test_columns_quote_inside_field(self):
+        text = ("name,salary_from,salary_to,area_name,published_at\n"
+                "Монитор 27\" инженер,100,200,Москва,2007-01-01\n"
+                "b,3,4,\"Омск\",2008-01-01\n"
+                "c,5,6,Казань,2009-01-01\n")
+        columns = self.read_columns(text)
+        self.assertEqual(columns.names, ["Монитор 27\" инженер", "b", "c"])
+        self.assertEqual(columns.years.tolist(), [2007, 2008, 2009])
+
+    def test_columns_crlf(self):
+        self.assertEqual(self.read_columns(CSV_SAMPLE.replace("\n", "\r\n")).years.tolist(), [2007] * 3)
+
+    def test_columns_empty(self):
+        self.assertEqual(len(self.read_columns("")), 0)
+
+class KernelParityTests(TestCase):
+    dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "csv")
+
+    def assertStatsEqual(self, stats, expected):
+        self.assertEqual([stats.count, stats.min, stats.max], [expected.count, expected.min, expected.max])
+        self.assertAlmostEqual(stats.total, expected.total, delta=1e-9 * abs(expected.total))
+        self.assertAlmostEqual(stats.variance, expected.variance, delta=1e-6 * abs(expected.variance))
+
+    def test_kernel_equals_row_by_row(self):
+        years = []
+        expected_years = []
+        for file_name in sorted(files(self.dir)):
+            data = DataWorker().get_data("Программист", CSVReader().get_columns(file_name))
+            expected = DataWorker().get_data_stream("Программист", CSVReader().iter_rows(file_name))[0]
+            self.assertEqual([data[0], data[2], data[4]], [expected[0], expected[2], expected[4]])
+            self.assertStatsEqual(data[1], expected[1])
+            self.assertStatsEqual(data[3], expected[3])
+            self.assertEqual(list(data[5]), list(expected[5]))
+            for city in expected[5]:
+                self.assertStatsEqual(data[5][city], expected[5][city])
+            self.assertEqual(data[6], expected[6])
+            years.append(data)
+            expected_years.append(expected)
+        total_vacancies = sum(year[2] for year in years)
+        self.assertEqual(print_data(merge_data(years), total_vacancies),
+                         print_data(merge_data(expected_years), total_vacancies))
+
+def create_vacancies():
+    rows = [("Аналитик", "Python\nSQL", "noExperience", "true", "Яндекс", ("100", "2000", "true", "RUR"), "Москва", "2007-12-03T17:40:09+0300"),
+            ("Программист", "Python\nDjango", "between1And3", "false", "Яндекс", ("1500", "3000", "false", "USD"), "Казань", "2008-01-05T10:00:00+0300"),
+            ("Аналитик", "SQL", "moreThan6", "false", "Сбер", ("3000", "1000", "true", "RUR"), "Москва", "2007-12-03T11:00:00+0300"),
+            ("Тестировщик", "Python\nSQL\nDjango", "between3And6", "true", "Сбер", ("500", "500", "true", "EUR"), "Москва", "2009-02-07T12:00:00+0300")]
+    return [Vacancy(name, "", skills, experience, premium, employer, Salary(*salary), area, published)
+            for name, skills, experience, premium, employer, salary, area, published in rows]
+
+class VacancyIndexTests(TestCase):
+    def setUp(self):
+        self.vacancies = create_vacancies()
+        self.index = VacancyIndex(self.vacancies)
+
+    def test_interval_tree(self):
+        intervals = [(1, 5, 0), (6, 8, 1), (4, 7, 2), (9, 9, 3), (0, 10, 4)]
+        tree = IntervalTree(intervals)
+        for point in range(-1, 12):
+            self.assertEqual(sorted(tree.stab(point)), [x[2] for x in intervals if x[0] <= point <= x[1]])
+
+    def test_filter_equal(self):
+        self.assertEqual(self.index.filter("area_name", "Москва"), [self.vacancies[0], self.vacancies[2], self.vacancies[3]])
+        self.assertEqual(self.index.filter("name", "Аналитик"), [self.vacancies[0], self.vacancies[2]])
+        self.assertEqual(self.index.filter("name", "Аналит"), [])
+
+    def test_filter_salary(self):
+        self.assertEqual(self.index.filter("salary", "1500"), [self.vacancies[0], self.vacancies[1]])
+        self.assertEqual(self.index.filter("salary", "2000"), [self.vacancies[0], self.vacancies[1]])
+        self.assertEqual(self.index.filter("salary", "500"), [self.vacancies[0], self.vacancies[3]])
+
+    def test_filter_key_skills(self):
+        self.assertEqual(self.index.filter("key_skills", "Python, SQL"), [self.vacancies[0], self.vacancies[3]])
+        self.assertEqual(self.index.filter("key_skills", "Go"), [])
+
+    def test_filter_mapped_fields(self):
+        self.assertEqual(self.index.filter("salary_currency", "Рубли"), [self.vacancies[0], self.vacancies[2]])
+        self.assertEqual(self.index.filter("premium", "Да"), [self.vacancies[0], self.vacancies[3]])
+        self.assertEqual(self.index.filter("experience_id", "От 3 до 6 лет"), [self.vacancies[3]])
+        self.assertEqual(self.index.filter("published_at", "03.12.2007"), [self.vacancies[0], self.vacancies[2]])
+
+    def test_filter_unknown_currency(self):
+        self.assertEqual(self.index.filter("salary_currency", "Тугрики"), [])
+
+class TableSortTests(TestCase):
+    def setUp(self):
+        self.vacancies = create_vacancies() * 5
+
+    def sort(self, sort_input, reverse_input="", range_input="", vacancies=None):
+        table = Table(self.vacancies, [], InputConect("", sort_input, reverse_input, range_input, ""))
+        return table.sort_vacancies(self.vacancies if vacancies is None else vacancies, table.input_connect.range[1] - 1)
+
+    def test_sort_salary(self):
+        expected = sorted(self.vacancies, key=lambda x: (x.salary.salary_from * currency_to_rub[x.salary.salary_currency] +
+                                                         x.salary.salary_to * currency_to_rub[x.salary.salary_currency]) // 2)
+        self.assertEqual(self.sort("Оклад"), expected)
+
+    def test_sort_top_k_is_stable(self):
+        for reverse in ["Да", "Нет"]:
+            for sort_input in ["Оклад", "Опыт работы", "Навыки", "Название", "Компания"]:
+                self.assertEqual(self.sort(sort_input, reverse, "1 3"), self.sort(sort_input, reverse)[:2])
+
+    def test_sort_many_fields(self):
+        expected = sorted(self.vacancies, key=lambda x: (x.employer_name, len(x.key_skills)), reverse=True)
+        self.assertEqual(self.sort("Компания, Навыки", "Да"), expected)
+
+    def test_sort_filtered(self):
+        vacancies = self.vacancies[::2]
+        self.assertEqual(self.sort("Навыки", vacancies=vacancies), sorted(vacancies, key=lambda x: len(x.key_skills)))
+
+    def test_sort_foreign_vacancies(self):
+        vacancies = create_vacancies()
+        self.assertEqual(self.sort("Название", vacancies=vacancies), sorted(vacancies, key=lambda x: x.name))
+
+    def test_sort_input_validation(self):
+        self.assertEqual(InputConect("", "Компания, Навыки", "", "", "").sort_field, ["Ок", "Компания, Навыки", False])
+        self.assertEqual(InputConect("", "Компания, Зарплата", "", "", "").sort_field, ["Параметр сортировки некорректен"])
+
+class TableRenderTests(TestCase):
+    def setUp(self):
+        self.vacancies = create_vacancies() * 10
+
+    def create_table(self, range_input="", columns_input=""):
+        return Table(self.vacancies, [], InputConect("", "", "", range_input, columns_input))
+
+    def test_fill_table_range(self):
+        table = self.create_table("3 7")
+        table.fill_table()
+        self.assertEqual([row[0] for row in table.table.rows], [3, 4, 5, 6])
+
+    def test_fill_table_columns(self):
+        table = self.create_table("1 3", "Оклад, Название")
+        table.fill_table()
+        self.assertEqual(table.table.field_names, ["№", "Название", "Оклад"])
+        self.assertEqual(table.table.rows[1], [2, "Программист", "1 500 - 3 000 (Доллары) (С вычетом налогов)"])
+
+    def test_fill_table_full(self):
+        table = self.create_table()
+        table.fill_table()
+        self.assertEqual(len(table.table.rows), len(self.vacancies))
+        self.assertEqual(table.table.rows[0], [1] + self.vacancies[0].to_list())
+
+    def test_pages(self):
+        pages = list(self.create_table(columns_input="Название").pages(15))
+        self.assertEqual(len(pages), 3)
+        self.assertIn("| 16 ", pages[1])
+        self.assertNotIn("| 15 ", pages[1])
+
+    def test_pages_range(self):
+        table = self.create_table("3 30", "Название")
+        pages = list(table.pages(15))
+        self.assertEqual(len(pages), 2)
+        self.assertIn("| 3 ", pages[0])
+        self.assertNotIn("| 2 ", pages[0])
+        self.assertIn("| 29 ", pages[1])
+        self.assertNotIn("| 30 ", pages[1])
+        table.fill_table()
+        self.assertEqual("".join(pages).count("Программист"), table.table.get_string().count("Программист"))
+
+TABLE_SAMPLE = ("name,description,key_skills,experience_id,premium,employer_name,salary_from,salary_to,salary_gross,"
+                "salary_currency,area_name,published_at\n"
+                "Аналитик,<b>Данные</b>,\"Python\nSQL\",noExperience,True,Яндекс,100,2000,True,RUR,Москва,2007-12-03T17:40:09+0300\n"
+                "Программист,Код,Python,between1And3,False,Сбер,1500,3000,False,USD,Казань,2008-01-05T10:00:00+0300\n"
+                "Тестировщик,Тесты,SQL,moreThan6,False,Сбер,500,700,True,RUR,Москва,2009-02-07T12:00:00+0300\n")
+
+class TableSessionTests(TestCase):
+    def setUp(self):
+        self.file_name = write_sample(TABLE_SAMPLE)
+        self.session = TableSession(self.file_name, cache_size=2)
+
+    def tearDown(self):
+        os.remove(self.file_name)
+
+    def test_query_equals_table(self):
+        query = ["Название региона: Москва", "Оклад", "Да", "", "Название, Оклад"]
+        table = Table(self.session.vacancies_objects, self.session.fields, InputConect(*query))
+        table.filter()
+        table.fill_table()
+        self.assertEqual(self.session.query(*query), table.table.get_string())
+
+    def test_query_messages(self):
+        self.assertEqual(self.session.query("Компания: Нет такой", "", "", "", ""), "Ничего не найдено")
+        self.assertEqual(self.session.query("Компания", "", "", "", ""), "Формат ввода некорректен")
+
+    def test_plan_cached(self):
+        first = self.session.run(TableSession.compile("Компания: Сбер", "", "", "", ""))
+        second = self.session.run(TableSession.compile("Компания: Сбер", "", "", "1 2", "Название"))
+        self.assertIs(first.vacancies_objects, second.vacancies_objects)
+
+    def test_plan_evicted(self):
+        first = self.session.run(TableSession.compile("Компания: Сбер", "", "", "", ""))
+        self.session.run(TableSession.compile("Компания: Яндекс", "", "", "", ""))
+        self.session.run(TableSession.compile("", "Оклад", "", "", ""))
+        again = self.session.run(TableSession.compile("Компания: Сбер", "", "", "", ""))
+        self.assertIsNot(first.vacancies_objects, again.vacancies_objects)
+        self.assertEqual(first.vacancies_objects, again.vacancies_objects)
+
+    def test_plan_compiled_once(self):
+        plan = TableSession.compile("Навыки: Python", "Оклад, Опыт работы", "Да", "1 3", "Название, Оклад")
+        self.assertIs(TableSession.compile("Навыки: Python", "Оклад, Опыт работы", "Да", "1 3", "Название, Оклад"), plan)
+        self.assertEqual(plan.titles, ["Название", "Оклад"])
+        table = Table(self.session.vacancies_objects, self.session.fields, plan.input_connect)
+        table.filter()
+        self.assertEqual(plan.execute(self.session.index), table.vacancies_objects)
+        self.assertEqual([plan.project(vacancy) for vacancy in table.vacancies_objects],
+                         [vacancy.to_row(["Название", "Оклад"]) for vacancy in table.vacancies_objects])
+
+class BeautifulStrTests(TestCase):
+    def test_same_as_regex_without_entities(self):
+        for text in ["<br><b>x</b>yz</br>", "  a \n\t b  ", "<p class=\"x\">Текст</p> <i>еще</i>", ""]:
+            self.assertEqual(TextEditor.beautifulStr(text), ' '.join(re.sub(r"<[^>]+>", '', text).split()))
+
+    def test_entities(self):
+        self.assertEqual(TextEditor.beautifulStr("a&nbsp;&nbsp;b &amp; c &#8212; &laquo;d&raquo;"), "a b & c — «d»")
+
+    def test_escaped_tags_kept(self):
+        self.assertEqual(TextEditor.beautifulStr("<b>&lt;div&gt;</b>"), "<div>")
+
+    def test_tags_between_words(self):
+        self.assertEqual(TextEditor.beautifulStr("<p>a</p>\n<p>b</p>c<br>d"), "a bcd")
+
+    def test_long_strings_not_cached(self):
+        TextEditor.clean_cached.cache_clear()
+        short = "<b>Программист</b>"
+        long = "<p>" + "описание " * TextEditor.cache_limit + "</p>"
+        self.assertEqual(TextEditor.beautifulStr(short), "Программист")
+        self.assertEqual(TextEditor.beautifulStr(long), " ".join(["описание"] * TextEditor.cache_limit))
+        self.assertEqual(TextEditor.clean_cached.cache_info().currsize, 1)
+
+class StageProfilerTests(TestCase):
+    def setUp(self):
+        self.file_names = [write_sample(), write_sample(CSV_SAMPLE.replace("2007-", "2008-"))]
+        self.profile_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        disable_profiling()
+        for file_name in self.file_names:
+            os.remove(file_name)
+        shutil.rmtree(self.profile_dir)
+
+    def check_report(self, executor_type):
+        profiler = enable_profiling()
+        expected = collect_data(self.file_names, "Программист", 1, executor_type)
+        disable_profiling()
+        self.assertEqual(print_data(expected[0], expected[1]),
+                         print_data(*collect_data(self.file_names, "Программист", 1, executor_type)))
+        report = profiler.report()
+        for stage in ["read", "decode", "build", "aggregate"]:
+            self.assertEqual(report["stages"][stage]["calls"], 2)
+        self.assertEqual(report["stages"]["merge"]["calls"], 1)
+        self.assertEqual(report["counters"], {"rows": 6})
+
+    def test_report_process(self):
+        self.check_report("process")
+
+    def test_report_thread(self):
+        self.check_report("thread")
+
+    def test_stream_report(self):
+        profiler = enable_profiling()
+        collect_stream(self.file_names[0], "Программист", 2, "process")
+        self.assertEqual(profiler.report()["stages"]["aggregate"]["calls"], 2)
+
+    def test_disabled(self):
+        self.assertIsNone(disable_profiling())
+
+    def test_merge_profiles(self):
+        profiler = enable_profiling(self.profile_dir)
+        collect_data(self.file_names, "Программист", 2, "process")
+        merged_name = os.path.join(self.profile_dir, "merged.pstats")
+        self.assertEqual(profiler.merge_profiles(merged_name), 2)
+        self.assertTrue(os.path.isfile(merged_name))
+        profiler.save(os.path.join(self.profile_dir, "stages.json"))
+        with open(os.path.join(self.profile_dir, "stages.json"), encoding="utf-8") as File:
+            self.assertEqual(json.load(File)["counters"], {"rows": 6})
+
+class BenchmarkTests(TestCase):
+    def setUp(self):
+        self.out_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.out_dir)
+
+    def test_generate_dataset(self):
+        file_names, table_name = generate_dataset(self.out_dir, 50, [2007, 2008], 3, 2)
+        self.assertEqual([os.path.basename(x) for x in file_names], ["vacancies_2007.csv", "vacancies_2008.csv"])
+        columns = CSVReader().get_columns(file_names[1])
+        self.assertEqual([len(columns), columns.year], [50, 2008])
+        self.assertLessEqual(len(columns.areas), 3)
+        self.assertLessEqual(len(columns.currencies), 2)
+        year, vacancies = CSVReader().get_vacancies(table_name)
+        self.assertEqual(len(vacancies), 50)
+
+    def test_generate_reproducible(self):
+        first = os.path.join(self.out_dir, "first.csv")
+        second = os.path.join(self.out_dir, "second.csv")
+        write_synthetic(first, 20, [2010], 5, 3, seed=1)
+        write_synthetic(second, 20, [2010], 5, 3, seed=1)
+        with open(first, encoding="utf-8-sig") as File, open(second, encoding="utf-8-sig") as Other:
+            self.assertEqual(File.read(), Other.read())
+
+    def test_find_regressions(self):
+        baseline = {"results": {"get_data": 1.0, "report": 2.0, "main_futures": None}}
+        results = {"results": {"get_data": 1.2, "report": 3.0, "main_futures": 5.0}}
+        self.assertEqual(find_regressions(results, baseline, 0.25), [["report", 2.0, 3.0]])
+
+class RenderGraphTests(TestCase):
+    def setUp(self):
+        self.out_dir = tempfile.mkdtemp()
+        file_name = write_sample()
+        self.data = print_data(*collect_data([file_name], "Программист", 1, "thread"))
+        os.remove(file_name)
+
+    def tearDown(self):
+        shutil.rmtree(self.out_dir)
+
+    def image_path(self, name):
+        return os.path.join(self.out_dir, name)
+
+    def test_render_graph(self):
+        self.assertEqual(render_graph(self.data, "Программист", self.image_path("a.png")), self.image_path("a.png"))
+        with open(self.image_path("a.png"), "rb") as File:
+            self.assertEqual(File.read(8), b"\x89PNG\r\n\x1a\n")
+
+    def check_render_graphs(self, executor_type):
+        jobs = [[self.data, "Программист", self.image_path("a.png")], [self.data, "Аналитик", self.image_path("b.png")]]
+        self.assertEqual(render_graphs(jobs, 2, executor_type), [job[2] for job in jobs])
+        self.assertTrue(all(os.path.getsize(job[2]) > 0 for job in jobs))
+
+    def test_render_graphs_process(self):
+        self.check_render_graphs("process")
+
+    def test_render_graphs_thread(self):
+        self.check_render_graphs("thread")
+
+    def test_render_graphs_same_path(self):
+        with self.assertRaises(ValueError):
+            render_graphs([[self.data, "a", self.image_path("a.png")], [self.data, "b", self.image_path("a.png")]])
+
+    def test_report_image_path(self):
+        report = Report("graph.jpg", self.data, "Программист", self.image_path("c.png"))
+        self.assertTrue(os.path.isfile(self.image_path("c.png")))
+        self.assertIn(self.image_path("c.png"), report.html)
+        self.assertFalse(os.path.isfile(self.image_path("d.png")))
+        Report("graph.jpg", self.data, "Программист", self.image_path("d.png"), render=False)
+        self.assertFalse(os.path.isfile(self.image_path("d.png")))
+
+    def test_render_svg(self):
+        svg = render_graph(self.data, "Программист")
+        self.assertTrue(svg.startswith("<svg"))
+        self.assertIn("Уровень зарплат по годам", svg)
+
+    def test_render_graphs_svg(self):
+        charts = render_graphs([[self.data, "Программист", None], [self.data, "Аналитик", None]], 2, "thread")
+        self.assertIn("з/п Аналитик", charts[1])
+
+    def test_report_svg(self):
+        report = Report("graph.jpg", self.data, "Программист", self.image_path("e.png"), image_format="svg")
+        self.assertIn(report.svg, report.html)
+        self.assertNotIn("<img", report.html)
+        self.assertFalse(os.path.isfile(self.image_path("e.png")))
+
+    def test_report_unknown_format(self):
+        with self.assertRaises(ValueError):
+            Report("graph.jpg", self.data, "Программист", image_format="gif")
+
+class HtmlGeneratorTests(TestCase):
+    def create_dicts(self, cities):
+        years = [2007, 2008]
+        return [[years, {2007: 100, 2008: 200}, {2007: 3, 2008: 4}, {2007: 150, 2008: 250}, {2007: 1, 2008: 2}],
+                [{"Город " + str(i): i for i in range(cities)}, {"Город " + str(i): 0.001 for i in range(cities)}]]
+
+    def test_rows(self):
+        page = HtmlGenerator().generate_html(self.create_dicts(2), "temp.png", "Программист")
+        self.assertIn("<tr><td>2008</td><td>200</td><td>250</td><td>4</td><td>2</td></tr>", page)
+        self.assertIn("<tr><td>Город 1</td><td>0,1%</td></tr>", page)
+        self.assertIn('<img src="temp.png">', page)
+
+    def test_escape(self):
+        dicts = self.create_dicts(0)
+        dicts[1][0]["<script>"] = 1
+        page = HtmlGenerator().generate_html(dicts, 'a".png', "C++ & <Go>")
+        self.assertNotIn("<script>", page)
+        self.assertIn("&lt;script&gt;", page)
+        self.assertIn("C++ &amp; &lt;Go&gt;", page)
+        self.assertIn('src="a&quot;.png"', page)
+
+    def test_write_html(self):
+        dicts = self.create_dicts(500)
+        file_name = os.path.join(tempfile.mkdtemp(), "report.html")
+        with open(file_name, "w", encoding="utf-8") as File:
+            HtmlGenerator().write_html(File, dicts, "temp.png", "Программист")
+        with open(file_name, encoding="utf-8") as File:
+            self.assertEqual(File.read(), HtmlGenerator().generate_html(dicts, "temp.png", "Программист"))
+        shutil.rmtree(os.path.dirname(file_name))
+
+FAKE_WKHTMLTOPDF = """import shlex, sys
+with open(sys.argv[0] + ".log", "a") as log:
+    log.write(" ".join(sys.argv[1:]) + "\\n")
+for line in sys.stdin:
+    args = shlex.split(line)
+    with open(args[-2], encoding="utf-8") as source, open(args[-1], "w", encoding="utf-8") as target:
+        target.write(source.read())
+"""
+
+class PdfBackendTests(TestCase):
+    def setUp(self):
+        self.out_dir = tempfile.mkdtemp()
+        file_name = write_sample()
+        self.data = print_data(*collect_data([file_name], "Программист", 1, "thread"))
+        os.remove(file_name)
+        self.reports = [Report("graph.jpg", self.data, prof_name, render=False) for prof_name in ["Программист", "C++ & Go"]]
+
+    def tearDown(self):
+        shutil.rmtree(self.out_dir)
+
+    def out_path(self, name):
+        return os.path.join(self.out_dir, name)
+
+    def test_matplotlib_backend(self):
+        MatplotlibPdfBackend().write(self.reports[0], self.out_path("a.pdf"))
+        with open(self.out_path("a.pdf"), "rb") as File:
+            self.assertEqual(File.read(5), b"%PDF-")
+
+    def test_wkhtmltopdf_one_process(self):
+        executable = self.out_path("wkhtmltopdf")
+        with open(executable, "w") as File:
+            File.write("#!" + sys.executable + "\n" + FAKE_WKHTMLTOPDF)
+        os.chmod(executable, 0o755)
+        pdf_names = [self.out_path("report a.pdf"), self.out_path("report b.pdf")]
+        WkhtmltopdfBackend(executable).write_many(self.reports, pdf_names)
+        for report, pdf_name in zip(self.reports, pdf_names):
+            with open(pdf_name, encoding="utf-8") as File:
+                self.assertEqual(File.read(), report.html)
+        with open(executable + ".log") as File:
+            self.assertEqual(File.read(), "--read-args-from-stdin\n")
+
+    def test_wkhtmltopdf_from_environment(self):
+        os.environ["WKHTMLTOPDF"] = "/opt/wkhtmltopdf"
+        try:
+            self.assertEqual(WkhtmltopdfBackend().executable, "/opt/wkhtmltopdf")
+        finally:
+            del os.environ["WKHTMLTOPDF"]
+
+    def test_wkhtmltopdf_missing(self):
+        with self.assertRaises(OSError):
+            WkhtmltopdfBackend(self.out_path("missing")).write(self.reports[0], self.out_path("a.pdf"))
+
+    def test_get_pdf_backend(self):
+        self.assertIsInstance(get_pdf_backend("matplotlib"), MatplotlibPdfBackend)
+        self.assertIsInstance(get_pdf_backend("wkhtmltopdf"), WkhtmltopdfBackend)
+        with self.assertRaises(ValueError):
+            get_pdf_backend("latex")
+
+    def check_matplotlib_backend_skips_html(self, image_format):
+        file_name = write_sample()
+        cwd = os.getcwd()
+        os.chdir(self.out_dir)
+        os.environ["REPORT_PDF_BACKEND"] = "matplotlib"
+        try:
+            with mock.patch("main.render_graph") as render_graph, \
+                    mock.patch.object(HtmlGenerator, "generate_html") as generate_html:
+                report = create_report(*collect_data([file_name], "Программист", 1, "thread"), "Программист",
+                                       self.out_path("a.pdf"), self.out_path("a.png"), image_format=image_format,
+                                       backend=MatplotlibPdfBackend())
+                main_batch([file_name], ["Программист", "C++"], 1, "thread", image_format=image_format)
+            render_graph.assert_not_called()
+            generate_html.assert_not_called()
+            self.assertIsNone(report.html)
+            self.assertEqual(sorted(os.listdir(self.out_dir)), ["a.pdf", "report_C_.pdf", "report_Программист.pdf"])
+        finally:
+            del os.environ["REPORT_PDF_BACKEND"]
+            os.chdir(cwd)
+            os.remove(file_name)
+
+    def test_matplotlib_backend_skips_svg(self):
+        self.check_matplotlib_backend_skips_html("svg")
+
+    def test_matplotlib_backend_skips_png(self):
+        self.check_matplotlib_backend_skips_html("png")
+
+
+class StartupTests(TestCase):
+    def test_import_is_light(self):
+        self.assertEqual(loaded_modules("import main"), [])
+
+    def test_table_mode_modules(self):
+        code = ("import main\n"
+                "table = main.Table([], main.vacancy_fields, main.InputConect('', '', '', '', ''))\n"
+                "table.fill_table()")
+        self.assertEqual(loaded_modules(code), ["prettytable"])
+
+    def test_bench_startup(self):
+        results = bench_startup(1)
+        self.assertEqual(list(results), ["python", "import main"])
+        self.assertTrue(all(elapsed > 0 for elapsed in results.values()))
+
+
+def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite(main))
+    return tests